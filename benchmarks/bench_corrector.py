@@ -0,0 +1,121 @@
+"""
+Microbenchmark of the OCR data corrections on synthetic raid data.
+
+Generates raid dictionaries with OCR-like misreadings of the map, status, factions, numbers
+and times (seeded, so runs are comparable) and reports the correction cost per raid for:
+
+  - per raid: a new OCRDataCorrector for every raid, how the raids used to be loaded
+  - one instance: a single OCRDataCorrector without memoization
+  - correct_raids: the batch API with the shared, memoized corrector, starting cold
+
+All three must give the same corrected raids, the benchmark fails otherwise.
+
+Usage:
+    python -m benchmarks.bench_corrector [--raids N] [--seed S] [--repeat N]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ocr_corrector import OCRDataCorrector, correct_raids, shared_corrector
+
+MAPS = ["Factory", "Interchange", "Customs", "Woods", "Lighthouse", "Reserve", "Shoreline", "Streets of Tarkov",
+        "Ground Zero", "The Lab"]
+STATUSES = ["Survived", "KIA", "MIA", "Killed in Action", "Missing in Action", "Run Through"]
+FACTIONS = ["USEC", "BEAR", "Scav", "Boss", "Rogue", "Raider"]
+
+# Characters OCR reads for one another
+MISREADINGS = {"o": "0", "O": "0", "0": "@", "9": "g", "e": "c", "l": "1", "i": "l", "I": "l", "S": "5", "u": "v",
+               "a": "o", "E": "F", "n": "r"}
+
+
+def misread(text, rng, probability=0.3):
+    """Replaces one character by a typical misreading with the given probability"""
+    candidates = [i for i, char in enumerate(text) if char in MISREADINGS]
+    if not candidates or rng.random() > probability:
+        return text
+    i = rng.choice(candidates)
+    return text[:i] + MISREADINGS[text[i]] + text[i + 1:]
+
+
+def random_time(rng):
+    return misread(f"{rng.randint(0, 1):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}", rng)
+
+
+def synthetic_raids(count, seed):
+    """Raid dictionaries as correct_raid_data takes them"""
+    rng = random.Random(seed)
+    raids = []
+    for n in range(count):
+        kill_list = {}
+        for row in range(1, rng.randint(0, 8) + 1):
+            kill_list[f"row{row}"] = {
+                "Time": random_time(rng),
+                "Player": f"Player{rng.randint(0, 5000)}",
+                "LVL": misread(str(rng.randint(1, 79)), rng),
+                "Faction": misread(rng.choice(FACTIONS), rng),
+                "Status": misread(rng.choice(["Killed", "Killed with M4A1"]), rng),
+            }
+        raids.append({
+            "map": misread(rng.choice(MAPS), rng),
+            "status": misread(rng.choice(STATUSES), rng),
+            "kills": misread(str(len(kill_list)), rng),
+            "exp": misread(str(rng.randint(0, 40000)), rng),
+            "level": misread(str(rng.randint(1, 79)), rng),
+            "time": random_time(rng),
+            "date": "Unknown",
+            "folder_name": f"{rng.randint(1, 28):02d}-{rng.randint(1, 12):02d}-2025_{n % 24:02d}-{n % 60:02d}",
+            "kill_list": kill_list,
+        })
+    return raids
+
+
+def per_raid(raids):
+    return [OCRDataCorrector().correct_raid_data(raid) for raid in raids]
+
+
+def one_instance(raids):
+    corrector = OCRDataCorrector()
+    return [corrector.correct_raid_data(raid) for raid in raids]
+
+
+def batch(raids):
+    shared_corrector.cache_clear()
+    return correct_raids(raids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--raids", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant, the fastest is reported")
+    args = parser.parse_args()
+
+    raids = synthetic_raids(args.raids, args.seed)
+    fields = sum(7 + 4 * len(raid["kill_list"]) for raid in raids)
+    print(f"{len(raids)} raids, {fields} corrected fields\n")
+
+    results = {}
+    print(f"{'variant':<16}{'us/raid':>10}{'total s':>10}")
+    for name, variant in [("per raid", per_raid), ("one instance", one_instance), ("correct_raids", batch)]:
+        seconds = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results[name] = variant(raids)
+            seconds.append(time.perf_counter() - start)
+        print(f"{name:<16}{min(seconds) / len(raids) * 1e6:>10.1f}{min(seconds):>10.3f}")
+
+    if not results["per raid"] == results["one instance"] == results["correct_raids"]:
+        sys.exit("The variants corrected the raids differently")
+
+    print(f"\n{'cache':<24}{'hits':>10}{'misses':>10}")
+    for name, info in shared_corrector().cache_info().items():
+        print(f"{name:<24}{info.hits:>10}{info.misses:>10}")
+
+
+if __name__ == "__main__":
+    main()
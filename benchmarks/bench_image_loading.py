@@ -0,0 +1,108 @@
+"""
+Compares the ROI-only screenshot decoding against full cv.imread decoding.
+
+Usage:
+    python -m benchmarks.bench_image_loading [raid folder ...] [--repeat N]
+
+Without a raid folder, a synthetic raid with mss-style PNGs is written to a temporary directory.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+
+import cv2 as cv
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ocr_regions import page_regions
+from src.roi_image_loader import load_raid_images, PNG_SIGNATURE
+
+
+def write_unfiltered_png(path, bgr):
+    """Writes a PNG the way mss does: RGB, filter type 0 on every row, zlib level 6"""
+    import zlib
+    import struct
+
+    height, width = bgr.shape[:2]
+    rgb = bgr[:, :, ::-1]
+    raw = b"".join(b"\x00" + rgb[y].tobytes() for y in range(height))
+
+    def chunk(chunk_type, payload):
+        return (struct.pack(">I", len(payload)) + chunk_type + payload
+                + struct.pack(">I", zlib.crc32(chunk_type + payload) & 0xffffffff))
+
+    with open(path, 'wb') as f:
+        f.write(PNG_SIGNATURE)
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw, 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+def create_synthetic_raid(folder):
+    """Writes four 2560x1440 screenshots with text in every ROI"""
+    rng = np.random.default_rng(0)
+    for page in range(4):
+        image = np.full((1440, 2560, 3), (22, 26, 28), dtype=np.uint8)
+        # Some background texture so the PNG doesn't compress unrealistically well
+        image += rng.integers(0, 6, size=image.shape, dtype=np.uint8)
+        for (y1, y2, x1, x2) in page_regions(page).values():
+            cv.putText(image, "Text 0123", (x1 + 4, y2 - 8), cv.FONT_HERSHEY_SIMPLEX,
+                       (y2 - y1) / 50, (197, 231, 246), 2)
+        write_unfiltered_png(os.path.join(folder, f"screenshot ({page + 1}).png"), image)
+
+
+def load_full(folder):
+    png_files = sorted(f for f in os.listdir(folder) if f.endswith('.png'))
+    return [cv.imread(os.path.join(folder, png)) for png in png_files]
+
+
+def measure(loader, folder, repeat):
+    """Returns the median time in ms and the peak traced memory in MB of loading one raid"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loader(folder)
+        times.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    images = loader(folder)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del images
+
+    return statistics.median(times), peak / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folders", nargs="*", help="raid folders with 4 screenshots each")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        folders = args.folders
+        if not folders:
+            create_synthetic_raid(temp_dir)
+            folders = [temp_dir]
+
+        loaders = {
+            "cv.imread (full BGR)": load_full,
+            "ROI stripes (gray)": load_raid_images,
+            "ROI stripes (gray, 1/2)": lambda folder: load_raid_images(folder, (2, 2, 2, 2)),
+        }
+
+        print(f"{'loader':<26}{'ms/raid':>10}{'peak MB':>10}")
+        for name, loader in loaders.items():
+            results = [measure(loader, folder, args.repeat) for folder in folders]
+            ms = statistics.mean(result[0] for result in results)
+            mb = statistics.mean(result[1] for result in results)
+            print(f"{name:<26}{ms:>10.1f}{mb:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
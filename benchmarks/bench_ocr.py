@@ -0,0 +1,236 @@
+"""
+End-to-end OCR benchmark on synthetic raids, runs on the CPU without game data.
+
+Renders labeled raids with benchmarks/synthetic_raids.py (or uses existing labeled raid
+folders), runs them through the OCR engine the way OCRWorker does and reports:
+
+  - latency per stage: screenshot loading, each of the four pages, saving the JSON
+  - recognition latency per field: fields read by the digit templates are timed on their
+    own, the time of each batched recognizer call is split evenly over its fields
+  - raids per second and exact-match accuracy per field
+
+With several --backends, every backend runs the same raids and a side by side table is
+printed at the end. The raids are rendered from a fixed seed, so results are comparable
+across commits; --output writes them as JSON together with the commit they were measured on.
+
+The synthetic raids are distorted, but rendered from the font the digit templates and the map
+classifier are built from, so their accuracy is an upper bound; --font renders them with
+another one. Accuracy worth quoting needs labeled screenshots of the game (--folders).
+Reserve has no map banner, the map classifier doesn't know it and always falls back to OCR.
+
+Usage:
+    python -m benchmarks.bench_ocr [--raids N] [--seed S] [--font PATH] [--clean] [--folders DIR ...]
+                                   [--gpu] [--backends torch onnx ...] [--output results.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.labels import find_labeled_raids, load_labels, FieldAccuracy
+from benchmarks.synthetic_raids import create_synthetic_raids, FONT_PATH
+from src.ocr_engine import RaidOCREngine, create_reader, save_to_json, PAGE_SECTIONS
+from src.ocr_cache import roi_cache_name
+from src.ocr_backends import BACKENDS, resolve_backend
+
+STAGES = ["load"] + list(PAGE_SECTIONS) + ["save"]
+
+
+def current_commit():
+    """Commit hash of the working tree, with a marker if it has local changes"""
+    root = os.path.join(os.path.dirname(__file__), "..")
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+                               capture_output=True, text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def field_name(name):
+    """Field name of a region as used in the accuracy table, e.g. 'KillList/Player'"""
+    cache_name = roi_cache_name(name)
+    if "/" in cache_name:
+        return cache_name
+    if cache_name == "map":
+        return "RaidStatistics/map"
+    if cache_name == "Eliminations":
+        return "ExperienceGained/Eliminations"
+    return f"Status/{cache_name}"
+
+
+class TimedEngine:
+    """Wraps an engine's stages and recognizer calls with timers"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.stage_seconds = {stage: [] for stage in STAGES}
+        self.field_seconds = {}
+        self.field_counts = {}
+
+        for page in range(len(PAGE_SECTIONS)):
+            self.wrap_page(page)
+
+        # Digit regions read by the templates are timed on their own, the rest of a
+        # recognizer call is split evenly over the regions that went to the recognizer
+        read_digit_regions = engine.read_digit_regions
+        template_call = {}
+
+        def timed_read_digit_regions(img, regions):
+            start = time.perf_counter()
+            results = read_digit_regions(img, regions)
+            template_call["seconds"] = time.perf_counter() - start
+            template_call["names"] = list(results)
+            for name in results:
+                self.add_field_time(name, template_call["seconds"] / len(results))
+            return results
+
+        recognize_regions = engine.recognize_regions
+
+        def timed_recognize_regions(img, regions):
+            template_call.clear()
+            start = time.perf_counter()
+            results = recognize_regions(img, regions)
+            seconds = time.perf_counter() - start - template_call.get("seconds", 0.0)
+            recognized = [name for name in regions if name not in template_call.get("names", [])]
+            for name in recognized:
+                self.add_field_time(name, seconds / len(recognized))
+            return results
+
+        engine.read_digit_regions = timed_read_digit_regions
+        engine.recognize_regions = timed_recognize_regions
+
+    def add_field_time(self, name, seconds):
+        field = field_name(name)
+        self.field_seconds[field] = self.field_seconds.get(field, 0.0) + seconds
+        self.field_counts[field] = self.field_counts.get(field, 0) + 1
+
+    def wrap_page(self, page):
+        method_name = f"process_image{page}"
+        method = getattr(self.engine, method_name)
+
+        def timed(img):
+            start = time.perf_counter()
+            result = method(img)
+            self.stage_seconds[PAGE_SECTIONS[page]].append(time.perf_counter() - start)
+            return result
+
+        setattr(self.engine, method_name, timed)
+
+    def process_folder(self, folder, output_dir):
+        start = time.perf_counter()
+        images = self.engine.load_images(folder)
+        self.stage_seconds["load"].append(time.perf_counter() - start)
+
+        all_data = self.engine.process_images(images)
+
+        start = time.perf_counter()
+        save_to_json(all_data, os.path.join(output_dir, os.path.basename(folder) + ".json"))
+        self.stage_seconds["save"].append(time.perf_counter() - start)
+        return all_data
+
+
+def run_benchmark(engine, folders, output_dir):
+    """Runs all raids through the engine, returns the results as a dictionary"""
+    timed = TimedEngine(engine)
+    accuracy = FieldAccuracy()
+
+    start = time.perf_counter()
+    for folder in folders:
+        accuracy.add(timed.process_folder(folder, output_dir), load_labels(folder))
+    wall_seconds = time.perf_counter() - start
+
+    return {
+        "raids": len(folders),
+        "raids_per_second": len(folders) / wall_seconds,
+        "stage_ms": {stage: {"median": statistics.median(seconds) * 1000, "mean": statistics.mean(seconds) * 1000}
+                     for stage, seconds in timed.stage_seconds.items() if seconds},
+        "field_ms": {field: timed.field_seconds[field] * 1000 / timed.field_counts[field]
+                     for field in sorted(timed.field_seconds)},
+        "accuracy": {field: accuracy.accuracy(field) for field in accuracy.fields()},
+        "overall_accuracy": accuracy.overall(),
+    }
+
+
+def print_results(results):
+    print(f"{results['raids']} raids, {results['raids_per_second']:.2f} raids/s, "
+          f"overall accuracy {results['overall_accuracy']:.1%}\n")
+
+    print(f"{'stage':<20}{'median ms':>12}{'mean ms':>12}")
+    for stage, ms in results["stage_ms"].items():
+        print(f"{stage:<20}{ms['median']:>12.1f}{ms['mean']:>12.1f}")
+
+    print(f"\n{'field':<32}{'ms/field':>10}{'accuracy':>10}")
+    for field in sorted(set(results["field_ms"]) | set(results["accuracy"])):
+        ms = results["field_ms"].get(field)
+        acc = results["accuracy"].get(field)
+        print(f"{field:<32}{'-' if ms is None else f'{ms:.1f}':>10}{'-' if acc is None else f'{acc:.1%}':>10}")
+
+
+def print_comparison(runs):
+    """Side by side summary of several backends"""
+    print("\n=== Backends side by side ===")
+    print(f"{'':<24}" + "".join(f"{backend:>14}" for backend in runs))
+    print(f"{'raids/s':<24}" + "".join(f"{results['raids_per_second']:>14.2f}" for results in runs.values()))
+    print(f"{'overall accuracy':<24}" + "".join(f"{results['overall_accuracy']:>14.1%}" for results in runs.values()))
+    for stage in STAGES:
+        print(f"{stage + ' ms':<24}" + "".join(f"{results['stage_ms'].get(stage, {}).get('mean', 0.0):>14.1f}"
+                                                for results in runs.values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--raids", type=int, default=20, help="number of synthetic raids")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--font", default=FONT_PATH, help="font the synthetic raids are rendered with")
+    parser.add_argument("--clean", action="store_true", help="render the synthetic raids without distortion")
+    parser.add_argument("--folders", nargs="+", help="use labeled raid folders instead of synthetic raids")
+    parser.add_argument("--gpu", action="store_true", help="run the recognizer on the GPU")
+    parser.add_argument("--backends", nargs="+", default=["auto"], choices=BACKENDS,
+                        help="recognizer backends to compare, see src/ocr_backends.py")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if args.folders:
+            folders = find_labeled_raids(args.folders)
+        else:
+            print(f"Rendering {args.raids} synthetic raids (seed {args.seed})...")
+            folders = create_synthetic_raids(os.path.join(temp_dir, "raids"), args.raids, args.seed, args.font,
+                                             not args.clean)
+
+        runs = {}
+        for backend in args.backends:
+            engine = RaidOCREngine(reader=create_reader(args.gpu, backend), log=lambda message: None)
+            engine.warm_up()
+
+            output_dir = os.path.join(temp_dir, "data", backend)
+            os.makedirs(output_dir)
+            runs[backend] = run_benchmark(engine, folders, output_dir)
+            runs[backend]["resolved_backend"] = resolve_backend(backend, args.gpu)
+
+    for backend, results in runs.items():
+        print(f"\n=== Backend: {backend} ({results['resolved_backend']}) ===")
+        print_results(results)
+
+    if len(runs) > 1:
+        print_comparison(runs)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"commit": current_commit(), "seed": args.seed, "gpu": args.gpu,
+                       "platform": platform.platform(), "cpu_count": os.cpu_count(), "runs": runs}, f, indent=4)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
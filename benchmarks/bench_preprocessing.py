@@ -0,0 +1,84 @@
+"""
+Accuracy vs. latency of the ROI preprocessing profiles.
+
+Runs the OCR engine over labeled raid folders (see benchmarks/labels.py) once per
+preprocessing profile and reports the exact-match accuracy per field together with the
+time spent in preprocessing and in the whole OCR per raid. Digit and text regions use
+separate profiles in the engine, so the best profile can be picked per ROI type from
+the digit and text fields of the table.
+
+Usage:
+    python -m benchmarks.bench_preprocessing <labeled raid folders> [--profiles none binary] [--cpu]
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.labels import find_labeled_raids, load_labels, FieldAccuracy
+from src.ocr_engine import RaidOCREngine, create_reader
+from src.roi_preprocessing import PREPROCESSING_PROFILES
+
+
+def run_profile(engine, raids, profile):
+    """Returns (FieldAccuracy, preprocessing ms per raid, OCR ms per raid) for one profile"""
+    engine.preprocessing = {"digits": profile, "text": profile}
+    accuracy = FieldAccuracy()
+
+    # Time the preprocessing on its own by wrapping the engine's crop preparation
+    preprocessing_seconds = [0.0]
+    prepare_crops = RaidOCREngine.prepare_crops
+
+    def timed_prepare_crops(img, regions):
+        start = time.perf_counter()
+        crops = prepare_crops(engine, img, regions)
+        preprocessing_seconds[0] += time.perf_counter() - start
+        return crops
+
+    engine.prepare_crops = timed_prepare_crops
+    ocr_seconds = 0.0
+    try:
+        for images, labels in raids:
+            start = time.perf_counter()
+            predicted = engine.process_images(images)
+            ocr_seconds += time.perf_counter() - start
+            accuracy.add(predicted, labels)
+    finally:
+        del engine.prepare_crops
+
+    return accuracy, preprocessing_seconds[0] * 1000 / len(raids), ocr_seconds * 1000 / len(raids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="folders containing labeled raid folders")
+    parser.add_argument("--profiles", nargs="+", default=list(PREPROCESSING_PROFILES),
+                        choices=list(PREPROCESSING_PROFILES))
+    parser.add_argument("--cpu", action="store_true", help="run the recognizer on the CPU")
+    args = parser.parse_args()
+
+    folders = find_labeled_raids(args.paths)
+    if not folders:
+        parser.error("no folders with a labels.json found")
+
+    engine = RaidOCREngine(reader=create_reader(gpu=not args.cpu), log=lambda message: None)
+    engine.warm_up()
+    raids = [(engine.load_images(folder), load_labels(folder)) for folder in folders]
+    print(f"{len(raids)} labeled raids\n")
+
+    results = {profile: run_profile(engine, raids, profile) for profile in args.profiles}
+
+    fields = sorted({field for accuracy, _, _ in results.values() for field in accuracy.fields()})
+    print(f"{'field':<28}" + "".join(f"{profile:>12}" for profile in args.profiles))
+    for field in fields:
+        print(f"{field:<28}" + "".join(f"{results[profile][0].accuracy(field):>12.1%}"
+                                       for profile in args.profiles))
+    print(f"{'overall':<28}" + "".join(f"{results[profile][0].overall():>12.1%}" for profile in args.profiles))
+    print(f"{'preprocessing ms/raid':<28}" + "".join(f"{results[profile][1]:>12.1f}" for profile in args.profiles))
+    print(f"{'OCR ms/raid':<28}" + "".join(f"{results[profile][2]:>12.1f}" for profile in args.profiles))
+
+
+if __name__ == "__main__":
+    main()
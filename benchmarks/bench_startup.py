@@ -0,0 +1,99 @@
+"""
+Cold start benchmark of the OCR process.
+
+Every measurement runs in a fresh interpreter, like a new OCR.exe, and reports the seconds
+since the interpreter started running the script:
+
+  - window: importing the OCR window module (needs PyQt5), what runs before the window shows
+  - reader: importing the engine, creating the reader and its first (warm-up) inference
+  - detection: the first reader.readtext, which loads the text detector on demand
+  - easyocr: a plain easyocr.Reader with its detector, how the reader was created before
+
+The detector cache next to the EasyOCR models is created by the first detection run, so
+run the benchmark twice to see the cached load.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat N] [--gpu] [--backend NAME]
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+PRELUDE = """
+import time, json, sys
+start = time.perf_counter()
+sys.path.insert(0, {root!r})
+timings = {{}}
+def mark(name):
+    timings[name] = time.perf_counter() - start
+"""
+
+SCRIPTS = {
+    "window": """
+import src.OCR
+mark("window module imported")
+""",
+    "reader": """
+from src.ocr_engine import RaidOCREngine, create_reader
+mark("engine imported")
+engine = RaidOCREngine(reader=create_reader({gpu}, {backend!r}), log=lambda message: None)
+mark("reader created")
+engine.warm_up()
+mark("first inference")
+""",
+    "detection": """
+import numpy as np
+from src.ocr_engine import create_reader
+reader = create_reader({gpu}, {backend!r})
+mark("reader created")
+reader.readtext(np.zeros((64, 256, 3), dtype=np.uint8))
+mark("first detection")
+""",
+    "easyocr": """
+import easyocr
+mark("easyocr imported")
+easyocr.Reader(['en'], gpu={gpu}, verbose=False)
+mark("reader created")
+""",
+}
+
+
+def run_script(name, gpu, backend):
+    """Runs one measurement in a new interpreter, returns its timings or None if it failed"""
+    code = PRELUDE.format(root=ROOT) + SCRIPTS[name].format(gpu=gpu, backend=backend) + "print(json.dumps(timings))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"{name} failed: {result.stderr.strip().splitlines()[-1] if result.stderr.strip() else ''}")
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the median is reported")
+    parser.add_argument("--gpu", action="store_true", help="run the recognizer on the GPU")
+    parser.add_argument("--backend", default="auto", help="recognizer backend, see src/ocr_backends.py")
+    args = parser.parse_args()
+
+    print(f"{'measurement':<40}{'median s':>10}{'min s':>10}")
+    for name in SCRIPTS:
+        runs = []
+        for _ in range(args.repeat):
+            timings = run_script(name, args.gpu, args.backend)
+            if timings is None:
+                break
+            runs.append(timings)
+        if not runs:
+            continue
+        for step in runs[0]:
+            seconds = [timings[step] for timings in runs]
+            print(f"{name + ': ' + step:<40}{statistics.median(seconds):>10.2f}{min(seconds):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
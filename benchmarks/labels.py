@@ -0,0 +1,78 @@
+"""
+Helpers for benchmarks on labeled raid folders.
+
+A labeled raid folder contains the 4 screenshots and a labels.json with the expected
+text in the same layout as raid_data.json, with plain strings instead of lists:
+
+    {"Status": {"Timer": "00:41:23", ...},
+     "KillList": {"row1": {"Player": "...", ...}, ...},
+     "RaidStatistics": {"map": "Customs"},
+     "ExperienceGained": {"Eliminations": "3"}}
+"""
+import os
+import json
+
+
+def find_labeled_raids(paths):
+    """Returns all raid folders with a labels.json in or below the given paths"""
+    folders = []
+    for path in paths:
+        for root, dirs, files in os.walk(path):
+            if "labels.json" in files:
+                folders.append(root)
+    return sorted(folders)
+
+
+def load_labels(folder):
+    with open(os.path.join(folder, "labels.json"), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def normalize(value):
+    """Joins list values and collapses whitespace"""
+    if isinstance(value, list):
+        value = " ".join(value)
+    return " ".join(str(value).split())
+
+
+def flatten_fields(data):
+    """
+    Flattens raid data or labels to {(field, row): text}
+    field is e.g. "Status/Timer" or "KillList/Player", row is None outside the kill list
+    """
+    fields = {}
+    for section, values in data.items():
+        if section == "KillList":
+            for row, row_data in values.items():
+                for name, value in row_data.items():
+                    fields[(f"{section}/{name}", row)] = normalize(value)
+        elif isinstance(values, dict):
+            for name, value in values.items():
+                fields[(f"{section}/{name}", None)] = normalize(value)
+    return fields
+
+
+class FieldAccuracy:
+    """Counts exact matches per field name over many raids"""
+
+    def __init__(self):
+        self.correct = {}
+        self.total = {}
+
+    def add(self, predicted, expected):
+        predicted_fields = flatten_fields(predicted)
+        for key, text in flatten_fields(expected).items():
+            field = key[0]
+            self.total[field] = self.total.get(field, 0) + 1
+            if predicted_fields.get(key, "") == text:
+                self.correct[field] = self.correct.get(field, 0) + 1
+
+    def fields(self):
+        return sorted(self.total)
+
+    def accuracy(self, field):
+        return self.correct.get(field, 0) / self.total[field]
+
+    def overall(self):
+        total = sum(self.total.values())
+        return sum(self.correct.values()) / total if total else 0.0
@@ -0,0 +1,183 @@
+"""
+Generator for labeled synthetic end-of-raid screenshots.
+
+Renders the four pages at 2560x1440 with the game font (Assets/bender.regular.otf) into the
+ROIs of src/ocr_regions.py and writes a labels.json next to them (see benchmarks/labels.py),
+so the OCR can be measured without game data. The same seed always gives the same raids.
+
+The digit templates and the map classifier are rendered from the same font, so clean pages
+would only measure them against themselves. Every page is therefore distorted like a real
+screenshot: rendered at a lower resolution, upscaled and blurred. --font renders with another
+font, --clean turns the distortion off. Accuracy on synthetic raids is still optimistic, only
+labeled screenshots of the game (bench_ocr.py --folders) give numbers worth quoting.
+
+Usage:
+    python -m benchmarks.synthetic_raids <output folder> [--raids N] [--seed S] [--font PATH] [--clean]
+"""
+import os
+import sys
+import json
+import random
+import argparse
+import functools
+
+import cv2 as cv
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ocr_regions import (STATUS_REGIONS, KILL_LIST_ROW_COUNT, RAID_STATISTICS_REGIONS, EXPERIENCE_REGIONS,
+                             kill_list_row_regions)
+
+FONT_PATH = os.path.join(os.path.dirname(__file__), "..", "Assets", "bender.regular.otf")
+
+# Colors (RGB) of the end-of-raid screens
+BACKGROUND = (22, 26, 28)
+TEXT = (197, 231, 246)
+
+MAPS = ["Customs", "Factory", "Ground Zero", "Interchange", "Lighthouse", "Shoreline",
+        "Streets of Tarkov", "The Lab", "Woods", "Reserve"]
+RAID_STATUSES = ["Survived", "Killed in Action", "Missing in Action", "Run Through"]
+FACTIONS = ["USEC", "BEAR", "Scav", "Rogue", "Raider", "Boss"]
+KILL_STATUSES = ["Killed", "Killed (Headshot)", "Killed with M4A1", "Killed with AK-74N (Headshot)"]
+# Pages are rendered at a random share of the resolution between these and upscaled again,
+# like a game running below the screenshot resolution
+MIN_RENDER_SCALE = 0.7
+MAX_RENDER_SCALE = 1.0
+
+# Range of the standard deviation of the Gaussian blur applied afterwards, in pixels
+MIN_BLUR_SIGMA = 0.3
+MAX_BLUR_SIGMA = 1.0
+
+NAME_PARTS = ["Tark", "ov", "Rat", "Chad", "Timmy", "Bear", "Shoot", "Wolf", "Kappa", "Rex", "Mike", "Ghost"]
+
+
+def random_name(rng):
+    return "".join(rng.choice(NAME_PARTS) for _ in range(rng.randint(2, 3))) + str(rng.randint(0, 99))
+
+
+def random_time(rng, max_minutes=60):
+    seconds = rng.randint(0, max_minutes * 60)
+    return f"{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+def random_raid_labels(rng):
+    """Labels of one raid in the labels.json layout, kill list rows without a kill are empty"""
+    kills = rng.randint(0, KILL_LIST_ROW_COUNT)
+    kill_list = {}
+    for i in range(1, KILL_LIST_ROW_COUNT + 1):
+        if i <= kills:
+            kill_list[f"row{i}"] = {"No": str(i), "Time": random_time(rng, 45), "Player": random_name(rng),
+                                    "LVL": str(rng.randint(1, 79)), "Faction": rng.choice(FACTIONS),
+                                    "Status": rng.choice(KILL_STATUSES)}
+        else:
+            kill_list[f"row{i}"] = {name: "" for name in ("No", "Time", "Player", "LVL", "Faction", "Status")}
+
+    return {
+        "Status": {"Next": "NEXT", "Status": rng.choice(RAID_STATUSES), "Timer": random_time(rng),
+                   "Experience": str(rng.randint(100, 60000)), "Names": random_name(rng),
+                   "Level": str(rng.randint(1, 79))},
+        "KillList": kill_list,
+        "RaidStatistics": {"map": rng.choice(MAPS)},
+        "ExperienceGained": {"Eliminations": str(kills)},
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def load_font(size, font_path=FONT_PATH):
+    from PIL import ImageFont
+    return ImageFont.truetype(font_path, size)
+
+
+def draw_text(draw, region, text, font_path=FONT_PATH):
+    """Draws text left aligned and vertically centered into a (y1, y2, x1, x2) region"""
+    if not text:
+        return
+    y1, y2, x1, x2 = region
+    size = min(int((y2 - y1) * 0.6), 36)
+
+    # Shrink long texts until they fit the region
+    while size > 10 and load_font(size, font_path).getlength(text) > x2 - x1 - 12:
+        size -= 2
+    font = load_font(size, font_path)
+
+    top, bottom = font.getbbox(text)[1::2]
+    draw.text((x1 + 6, (y1 + y2) // 2 - (top + bottom) // 2), text, fill=TEXT, font=font)
+
+
+def distort_page(bgr, rng):
+    """Renders a page at a lower resolution and upscales and blurs it, like a real screenshot"""
+    height, width = bgr.shape[:2]
+    scale = rng.uniform(MIN_RENDER_SCALE, MAX_RENDER_SCALE)
+    small = cv.resize(bgr, (round(width * scale), round(height * scale)), interpolation=cv.INTER_AREA)
+    bgr = cv.resize(small, (width, height), interpolation=cv.INTER_LINEAR)
+    return cv.GaussianBlur(bgr, (0, 0), rng.uniform(MIN_BLUR_SIGMA, MAX_BLUR_SIGMA))
+
+
+def render_page(texts, noise_rng, font_path=FONT_PATH, distort=True):
+    """Renders one 2560x1440 page with the given {region: text}, returns a BGR image"""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (2560, 1440), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    for region, text in texts:
+        draw_text(draw, region, text, font_path)
+
+    bgr = np.asarray(image)[:, :, ::-1].copy()
+    if distort:
+        bgr = distort_page(bgr, noise_rng)
+    # A little sensor-like noise so the PNGs don't compress unrealistically well
+    bgr += noise_rng.integers(0, 6, size=bgr.shape, dtype=np.uint8)
+    return bgr
+
+
+def render_raid(labels, folder, seed=0, font_path=FONT_PATH, distort=True):
+    """Writes the four screenshots of a raid and its labels.json into folder"""
+    os.makedirs(folder, exist_ok=True)
+    noise_rng = np.random.default_rng(seed)
+
+    kill_texts = []
+    for i in range(1, KILL_LIST_ROW_COUNT + 1):
+        row = labels["KillList"][f"row{i}"]
+        kill_texts += [(region, row[name]) for name, region in kill_list_row_regions(i).items()]
+
+    pages = [
+        [(region, labels["Status"][name]) for name, region in STATUS_REGIONS.items()],
+        kill_texts,
+        [(region, labels["RaidStatistics"][name]) for name, region in RAID_STATISTICS_REGIONS.items()],
+        [(region, labels["ExperienceGained"][name]) for name, region in EXPERIENCE_REGIONS.items()],
+    ]
+    for page, texts in enumerate(pages):
+        cv.imwrite(os.path.join(folder, f"screenshot ({page + 1}).png"),
+                   render_page(texts, noise_rng, font_path, distort))
+
+    with open(os.path.join(folder, "labels.json"), 'w', encoding='utf-8') as f:
+        json.dump(labels, f, ensure_ascii=False, indent=4)
+
+
+def create_synthetic_raids(output_folder, count, seed=0, font_path=FONT_PATH, distort=True):
+    """Writes count labeled raids into output_folder, returns the raid folders"""
+    rng = random.Random(seed)
+    folders = []
+    for i in range(count):
+        folder = os.path.join(output_folder, f"synthetic_raid_{i:03d}")
+        render_raid(random_raid_labels(rng), folder, seed + i, font_path, distort)
+        folders.append(folder)
+    return folders
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="folder the raid folders are written to")
+    parser.add_argument("--raids", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--font", default=FONT_PATH, help="font the texts are rendered with")
+    parser.add_argument("--clean", action="store_true", help="write the pages without distortion")
+    args = parser.parse_args()
+
+    folders = create_synthetic_raids(args.output, args.raids, args.seed, args.font, not args.clean)
+    print(f"Wrote {len(folders)} raids to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,20 +6,21 @@ from PyQt5.QtWidgets import (QApplication, QTabWidget, QWidget,
                              QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
                              QTableWidget, QTableWidgetItem, QFormLayout,
                              QHeaderView, QGroupBox, QMessageBox, QScrollArea,
-                             QFileDialog, QTextEdit)
+                             QFileDialog, QTextEdit, QCheckBox, QSpinBox)
 from PyQt5.QtCore import Qt, QSettings, QThread, pyqtSignal, QTimer, QProcess
 from PyQt5.QtGui import QColor, QPalette, QFont, QPixmap, QPainter, QFontDatabase, QPen, QBrush
 from PyQt5.QtChart import QChart, QChartView, QPieSeries
 import time
+import queue
 from datetime import datetime
 import ctypes
-import mss
 
 from src.ui.ExpandableRaidTile import ExpandableRaidTile
 from src.ui.BorderlessMainWindow import BorderlessMainWindow
 from eft_registry_finder import get_eft_logs_path
 
 from src.AssetManager import AssetManager
+from src.ocr_service import OCRServiceClient
 
 
 class CSharpOutputReader(QThread):
@@ -27,13 +28,14 @@ class CSharpOutputReader(QThread):
     Thread to read output from the C# LogWatcher process
     """
     output_received = pyqtSignal(str)
+    # Folder name of a raid whose screenshots should be taken, handled by the main window
+    screenshot_requested = pyqtSignal(str)
 
     def __init__(self, process):
         super().__init__()
         self.process = process
         self.running = True
         self.buffer = bytearray()
-        self.app = None  # Reference to main application for screenshot triggering
 
     def run(self):
         """
@@ -88,9 +90,8 @@ class CSharpOutputReader(QThread):
                         # Process specific commands from the LogWatcher
                         if "TRIGGER_SCREENSHOT" in line:
                             self.output_received.emit("[PYTHON] CSharpOutputReader: Trigger detected in backend.log")
-                            if self.app is not None:
-                                folder_name = datetime.now().strftime("%d-%m-%Y_%H-%M")
-                                self.app.screenshot_script(folder_name)
+                            folder_name = datetime.now().strftime("%d-%m-%Y_%H-%M")
+                            self.screenshot_requested.emit(folder_name)
 
                     # Reset buffer
                     self.buffer.clear()
@@ -102,10 +103,6 @@ class CSharpOutputReader(QThread):
                 self.buffer.clear()
                 time.sleep(0.1)  # Short pause to reduce CPU load
 
-    def set_application(self, app):
-        """Sets a reference to the main application for communication"""
-        self.app = app
-
     def stop(self):
         self.running = False
         # Wait until the thread is finished
@@ -113,7 +110,277 @@ class CSharpOutputReader(QThread):
             self.wait(1000)  # Wait max. 1 second
 
 
+class OCRServiceJob(QThread):
+    """
+    Thread that sends an OCR job to the OCR service and forwards the streamed results
+    """
+    message_received = pyqtSignal(str, str)
+    raid_processed = pyqtSignal(str)
+    job_finished = pyqtSignal(int)
+
+    def __init__(self, client, root_folder, data_dir, archive_folder, connect_timeout=60):
+        super().__init__()
+        self.client = client
+        self.root_folder = os.path.abspath(root_folder)
+        self.data_dir = os.path.abspath(data_dir)
+        self.archive_folder = os.path.abspath(archive_folder)
+        self.connect_timeout = connect_timeout
+
+    def run(self):
+        processed = 0
+        try:
+            # The service may still be loading the model if it was just started
+            if not self.client.wait_until_ready(self.connect_timeout):
+                self.message_received.emit("OCR service did not become ready in time", "error")
+                return
+
+            start = time.perf_counter()
+            first_result = True
+            for event in self.events():
+                if event["event"] == "log":
+                    self.message_received.emit(event["message"], "python")
+                elif event["event"] == "result":
+                    if first_result:
+                        self.message_received.emit(
+                            f"First OCR result after {(time.perf_counter() - start) * 1000:.0f} ms", "python")
+                        first_result = False
+                    self.handle_result(event)
+                    self.raid_processed.emit(event["folder"])
+                elif event["event"] == "error":
+                    self.message_received.emit(f"OCR service error: {event['message']}", "error")
+                elif event["event"] == "done":
+                    processed = event["processed"]
+        except (OSError, EOFError) as e:
+            self.message_received.emit(f"Lost connection to OCR service: {e}", "error")
+        finally:
+            self.finish(processed)
+            self.job_finished.emit(processed)
+
+    def finish(self, processed):
+        """Called when the job has ended, successfully or not"""
+
+    def events(self):
+        """Sends the job to the service, returns the streamed events"""
+        return self.client.process_folders(self.root_folder, self.data_dir, self.archive_folder)
+
+    def handle_result(self, event):
+        """Called for every raid result, the service has already saved it"""
+
+
+class OCRServiceWatcher(QThread):
+    """
+    Thread that waits for a just started OCR service to accept connections, so the window
+    never has to connect to the service itself
+    """
+    service_ready = pyqtSignal(bool)
+
+    def __init__(self, client, timeout=300):
+        super().__init__()
+        self.client = client
+        self.timeout = timeout
+
+    def run(self):
+        self.service_ready.emit(self.client.wait_until_ready(self.timeout))
+
+
+class OCRMemoryJob(OCRServiceJob):
+    """
+    Thread that sends the pages of one raid captured into memory to the OCR service
+    and saves the result, no screenshot is read from disk
+    """
+
+    def __init__(self, client, capture, data_dir, connect_timeout=60):
+        super().__init__(client, "Raids new", data_dir, "Raids old", connect_timeout)
+        # raid_capture.RaidCapture with the StripeImages of the four pages
+        self.capture = capture
+        self.folder_name = capture.folder_name
+        # perf_counter() of the first capture, for the capture-to-result latency
+        self.first_capture = capture.first_capture
+        self.saved = False
+
+    def events(self):
+        return self.client.process_images(self.capture.pages, self.folder_name)
+
+    def finish(self, processed):
+        # A raid without a saved result must not get lost, the normal OCR picks it up from 'Raids new'
+        if self.saved:
+            return
+        try:
+            folder = self.capture.requeue(self.root_folder)
+            self.message_received.emit(f"Raid {self.folder_name} was not OCRed from memory, queued in {folder}",
+                                       "warning")
+        except Exception as e:
+            self.message_received.emit(f"Raid {self.folder_name} could not be queued for the OCR: {str(e)}", "error")
+
+    def handle_result(self, event):
+        data_path = os.path.join(self.data_dir, self.folder_name)
+        os.makedirs(data_path, exist_ok=True)
+        with open(os.path.join(data_path, "raid_data.json"), 'w', encoding='utf-8') as f:
+            json.dump(event["data"], f, ensure_ascii=False, indent=4)
+        self.saved = True
+
+        self.message_received.emit(
+            f"Raid {self.folder_name} OCRed {(time.perf_counter() - self.first_capture) * 1000:.0f} ms "
+            f"after the first capture", "python")
+
+
+class ScreenshotWorker(QThread):
+    """
+    Thread that runs the screenshot sequences of the raids one after another.
+    Pages are grabbed into memory and the PNGs are written by the writer threads of the
+    capture while the next page is clicked and grabbed. The window is only updated through
+    the signals.
+    """
+    message_received = pyqtSignal(str, str)
+    raid_captured = pyqtSignal(object)
+    sequence_finished = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        # (folder name, options) of the requested sequences, None stops the thread
+        self.requests = queue.Queue()
+        # Pages waited for after clicking "Next" and how many of them timed out
+        self.page_waits = 0
+        self.page_wait_timeouts = 0
+
+    def request(self, folder_name, options):
+        """Queues the screenshot sequence of a raid, see EFTTracker.screenshot_script for the options"""
+        self.requests.put((folder_name, options))
+
+    def stop(self):
+        self.requests.put(None)
+        if self.isRunning():
+            self.wait(5000)
+
+    def run(self):
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            folder_name, options = request
+            try:
+                self.run_sequence(folder_name, options)
+            except Exception as e:
+                import traceback
+                self.message_received.emit(f"Fehler während der Screenshot-Sequenz: {str(e)}", "error")
+                self.message_received.emit(traceback.format_exc(), "error")
+
+    def set_mouse_pos(self, x, y):
+        ctypes.windll.user32.SetCursorPos(x, y)
+
+    def mouse_click(self):
+        mouseLeft_down = 0x0002
+        mouseLeft_up = 0x0004
+        ctypes.windll.user32.mouse_event(mouseLeft_down, 0, 0, 0, 0)
+        ctypes.windll.user32.mouse_event(mouseLeft_up, 0, 0, 0, 0)
+
+    def next_page(self, detector, page):
+        """Clicks "Next" and waits until page n is shown, or a fixed time without a detector"""
+        before = detector.signature() if detector is not None else None
+        self.mouse_click()
+        if detector is None:
+            time.sleep(0.3)  # Warte, bis die neue Seite geladen ist
+            return
+
+        seconds, ready = detector.wait_for_change(before)
+        self.page_waits += 1
+        if not ready:
+            self.page_wait_timeouts += 1
+            self.message_received.emit(f"Page {page} did not change within {seconds:.1f}s, capturing anyway",
+                                       "warning")
+
+    def run_sequence(self, folder_name, options):
+        """Nimmt eine Reihe von Screenshots für einen Raid auf"""
+        from src.raid_capture import RaidCapture, PageChangeDetector
+
+        # In memory the ROIs go to the OCR service and the full screenshots optionally to the
+        # archive, otherwise only the screenshots are written to 'Raids new'
+        if options["in_memory"]:
+            capture = RaidCapture(folder_name, png_folder="Raids old" if options["archive"] else None,
+                                  compression_level=options["compression_level"])
+        else:
+            capture = RaidCapture(folder_name, png_folder="Raids new", keep_rois=False,
+                                  compression_level=options["compression_level"])
+
+        # Capture each page as soon as it has loaded instead of after a fixed delay
+        detector = None
+        if options["wait_for_page_change"]:
+            try:
+                detector = PageChangeDetector()
+            except Exception as e:
+                self.message_received.emit(f"Page change detection unavailable, using fixed delays: {e}", "warning")
+
+        try:
+            # Positioniere die Maus auf den "Next"-Button
+            self.set_mouse_pos(*options["next_button"])
+
+            # Screenshots 1-3, each followed by "Next", then screenshot 4
+            for page in range(1, 4):
+                capture.capture_page()
+                self.next_page(detector, page + 1)
+            capture.capture_page()
+
+            # Zurück zu vorherigen Bildschirmen
+            self.set_mouse_pos(*options["back_button"])
+            time.sleep(0.05)
+            self.mouse_click()
+            time.sleep(0.05)
+            self.mouse_click()
+            time.sleep(0.05)
+            self.mouse_click()
+
+            self.message_received.emit(f"Screenshot-Sequenz abgeschlossen für: {folder_name}", "python")
+            self.message_received.emit(capture.stats(), "python")
+            if detector is not None:
+                self.message_received.emit(f"{detector.stats()} ({self.page_wait_timeouts} of {self.page_waits} "
+                                           f"pages timed out so far)", "python")
+
+            if options["in_memory"]:
+                self.raid_captured.emit(capture)
+            self.sequence_finished.emit(folder_name)
+
+            # The game is free again, the screenshots may still be being written
+            start = time.perf_counter()
+            errors = capture.wait_for_writes()
+            for error in errors:
+                self.message_received.emit(f"Screenshot konnte nicht gespeichert werden: {error}", "error")
+            if capture.writes and not errors:
+                self.message_received.emit(f"{len(capture.writes)} screenshots written "
+                                           f"{(time.perf_counter() - start) * 1000:.0f} ms after the sequence",
+                                           "python")
+
+        finally:
+            capture.close()
+            if detector is not None:
+                detector.close()
+
+
+class ArchiveCompactionJob(QThread):
+    """
+    Thread that compacts the raids in 'Raids old' at low priority, see src/archive_compactor.py
+    """
+    message_received = pyqtSignal(str, str)
+
+    def __init__(self, archive_folder):
+        super().__init__()
+        from src.archive_compactor import ArchiveCompactor
+        self.compactor = ArchiveCompactor(archive_folder, log=lambda message: self.message_received.emit(message,
+                                                                                                         "python"))
+
+    def run(self):
+        try:
+            self.compactor.run()
+        except Exception as e:
+            self.message_received.emit(f"Archive compaction failed: {str(e)}", "error")
+
+    def stop(self):
+        self.compactor.stop()
+        if self.isRunning():
+            self.wait(10000)
+
+
 class EFTTracker(BorderlessMainWindow):
+
     def __init__(self):
         super().__init__()
         self.assets = asset_manager
@@ -147,6 +414,28 @@ class EFTTracker(BorderlessMainWindow):
         # Try to auto-detect EFT path with a slight delay to ensure the UI is ready
         QTimer.singleShot(500, self.initialize_eft_path)
 
+        # Start the OCR service early so the model is already loaded when OCR is requested
+        self.ocr_service_client = OCRServiceClient()
+        self.ocr_service_process = None
+        self.ocr_service_job = None
+        # Set by the OCRServiceWatcher once the started service accepts connections
+        self.ocr_service_ready = False
+        self.ocr_service_watcher = None
+        # Running OCR jobs of raids captured into memory
+        self.ocr_memory_jobs = []
+        QTimer.singleShot(2000, self.start_ocr_service)
+
+        # Screenshot sequences run on their own thread, the LogWatcher reader only requests them
+        self.screenshot_worker = ScreenshotWorker()
+        self.screenshot_worker.message_received.connect(self.log_message)
+        self.screenshot_worker.raid_captured.connect(self.start_memory_ocr)
+        self.screenshot_worker.sequence_finished.connect(self.screenshot_sequence_finished)
+        self.screenshot_worker.start()
+
+        # Compact the screenshot archive in the background once the app has settled
+        self.archive_compaction_job = None
+        QTimer.singleShot(60000, self.start_archive_compaction)
+
         saved_log_path = self.settings.value("eft_log_path", "", str)
         if saved_log_path:
             QTimer.singleShot(600, lambda: self.write_log_path_to_config(saved_log_path))
@@ -264,31 +553,13 @@ class EFTTracker(BorderlessMainWindow):
         # Reset process reference
         self.process = None
 
-    def set_mouse_pos(self, x, y):
-        ctypes.windll.user32.SetCursorPos(x, y)
-
-    def mouse_click(self):
-        mouseLeft_down = 0x0002
-        mouseLeft_up = 0x0004
-        ctypes.windll.user32.mouse_event(mouseLeft_down, 0, 0, 0, 0)
-        ctypes.windll.user32.mouse_event(mouseLeft_up, 0, 0, 0, 0)
-
-    def take_screenshot(self, n, dir_raid=datetime.now().strftime("%d.%m.%Y %H-%M"), dateiname=None):
-        dir_screenshots = "Raids new"
-
-        raid_path = os.path.join(dir_screenshots, dir_raid)
-
-        if not os.path.exists(raid_path):
-            os.makedirs(raid_path)
-
-        if dateiname is None:
-            dateiname = f"screenshot {dir_raid} ({n}).png"
-
-        filepath = os.path.join(dir_screenshots, dir_raid, dateiname)
-
-        with mss.mss() as sct:
-            screenshot = sct.shot(output=filepath)
-            print(f"Screenshot gespeichert: {screenshot}")
+    def start_memory_ocr(self, capture):
+        """OCRs the pages of a raid captured into memory with the OCR service"""
+        job = OCRMemoryJob(self.ocr_service_client, capture, self.ocr_data_dir)
+        job.message_received.connect(self.log_message)
+        job.job_finished.connect(self.ocr_job_finished)
+        self.ocr_memory_jobs = [running for running in self.ocr_memory_jobs if running.isRunning()] + [job]
+        job.start()
 
     def screenshot_script(self, folder_name=None):
         """Nimmt eine Reihe von Screenshots für einen Raid auf"""
@@ -330,51 +601,45 @@ class EFTTracker(BorderlessMainWindow):
         self.log_message(f"Next button coordinates: ({buttonNextX}, {buttonNextY})", "python")
         self.log_message(f"Back button coordinates: ({buttonBackX}, {buttonBackY})", "python")
 
+        # With the OCR service running, the pages are captured into memory and OCRed right away
+        # instead of being written to 'Raids new' for the next OCR run
+        options = {
+            "next_button": (buttonNextX, buttonNextY),
+            "back_button": (buttonBackX, buttonBackY),
+            "in_memory": self.settings.value("in_memory_capture", True, bool) and self.ocr_service_usable(),
+            "archive": self.settings.value("archive_screenshots", True, bool),
+            "wait_for_page_change": self.settings.value("wait_for_page_change", True, bool),
+            "compression_level": self.settings.value("png_compression_level", 1, int),
+        }
+        self.screenshot_worker.request(folder_name, options)
+
+    def start_archive_compaction(self):
+        """Starts compacting 'Raids old' if enabled in the settings"""
+        if not self.settings.value("compact_archive", False, bool):
+            return
+        if self.archive_compaction_job is not None and self.archive_compaction_job.isRunning():
+            return
+        self.archive_compaction_job = ArchiveCompactionJob("Raids old")
+        self.archive_compaction_job.message_received.connect(self.log_message)
+        self.archive_compaction_job.start(QThread.LowestPriority)
+
+    def set_archive_compaction(self, enabled):
+        self.settings.setValue("compact_archive", enabled)
+        if enabled:
+            self.start_archive_compaction()
+        elif self.archive_compaction_job is not None:
+            # Stops after the raid being compacted
+            self.archive_compaction_job.compactor.stop()
+
+    def screenshot_sequence_finished(self, folder_name):
+        """Resets the LogWatcher once the pages of a raid are captured"""
+        # Try to reset the statistics flag, but catch errors
         try:
-            # Positioniere die Maus auf den "Next"-Button
-            self.set_mouse_pos(buttonNextX, buttonNextY)
-
-            # Screenshot 1
-            self.take_screenshot(1, folder_name)
-            self.mouse_click()
-            time.sleep(0.3)  # Warte, bis die neue Seite geladen ist
-
-            # Screenshot 2
-            self.take_screenshot(2, folder_name)
-            self.mouse_click()
-            time.sleep(0.3)
-
-            # Screenshot 3
-            self.take_screenshot(3, folder_name)
-            self.mouse_click()
-            time.sleep(0.3)
-
-            # Screenshot 4
-            self.take_screenshot(4, folder_name)
-
-            # Zurück zu vorherigen Bildschirmen
-            self.set_mouse_pos(buttonBackX, buttonBackY)
-            time.sleep(0.05)
-            self.mouse_click()
-            time.sleep(0.05)
-            self.mouse_click()
-            time.sleep(0.05)
-            self.mouse_click()
-
-            self.log_message(f"Screenshot-Sequenz abgeschlossen für: {folder_name}", "python")
-
-            # Try to reset the statistics flag, but catch errors
-            try:
-                self.reset_statistics_flag()
-            except Exception as reset_error:
-                self.log_message(f"Fehler beim Zurücksetzen des Statistik-Flags: {str(reset_error)}", "error")
-                # Log that manual intervention might be needed
-                self.log_message("Benutzereingriff könnte erforderlich sein - bitte LogWatcher neu starten.", "warning")
-
-        except Exception as e:
-            self.log_message(f"Fehler während der Screenshot-Sequenz: {str(e)}", "error")
-            import traceback
-            self.log_message(traceback.format_exc(), "error")
+            self.reset_statistics_flag()
+        except Exception as reset_error:
+            self.log_message(f"Fehler beim Zurücksetzen des Statistik-Flags: {str(reset_error)}", "error")
+            # Log that manual intervention might be needed
+            self.log_message("Benutzereingriff könnte erforderlich sein - bitte LogWatcher neu starten.", "warning")
 
     def reset_statistics_flag(self):
         """Resets the statisticsFound flag in the LogWatcher"""
@@ -627,8 +892,8 @@ class EFTTracker(BorderlessMainWindow):
 
             # Create and start the output reader thread
             self.output_reader = CSharpOutputReader(self.process)
-            self.output_reader.set_application(self)  # Set reference to self for triggering functions
             self.output_reader.output_received.connect(self.on_process_output)
+            self.output_reader.screenshot_requested.connect(self.screenshot_script)
             self.output_reader.start()
 
             self.log_message("C# LogWatcher successfully started", "python")
@@ -957,12 +1222,41 @@ class EFTTracker(BorderlessMainWindow):
         refresh_button = QPushButton("Reload OCR Data")
         refresh_button.clicked.connect(self.reload_ocr_data)
 
+        # Capture the end-of-raid pages into memory and OCR them right away with the OCR service
+        memory_capture_checkbox = QCheckBox("OCR raids straight from memory (uses the OCR service)")
+        memory_capture_checkbox.setChecked(self.settings.value("in_memory_capture", True, bool))
+        memory_capture_checkbox.toggled.connect(lambda checked: self.settings.setValue("in_memory_capture", checked))
+        archive_checkbox = QCheckBox("Keep the full screenshots of raids OCRed from memory in 'Raids old'")
+        archive_checkbox.setChecked(self.settings.value("archive_screenshots", True, bool))
+        archive_checkbox.toggled.connect(lambda checked: self.settings.setValue("archive_screenshots", checked))
+        # Capture each page as soon as it has loaded instead of after a fixed delay
+        page_change_checkbox = QCheckBox("Capture each raid page as soon as it has loaded")
+        page_change_checkbox.setChecked(self.settings.value("wait_for_page_change", True, bool))
+        page_change_checkbox.toggled.connect(lambda checked: self.settings.setValue("wait_for_page_change", checked))
+        # Replace the full screenshots of older raids by their text regions and a small preview
+        compact_checkbox = QCheckBox("Compact the screenshots in 'Raids old' (keeps the text regions and a preview)")
+        compact_checkbox.setChecked(self.settings.value("compact_archive", False, bool))
+        compact_checkbox.toggled.connect(self.set_archive_compaction)
+        # zlib level of the written screenshots, lower is faster and the files are larger
+        compression_layout = QHBoxLayout()
+        compression_layout.addWidget(QLabel("PNG compression level (0-9):"))
+        compression_spinbox = QSpinBox()
+        compression_spinbox.setRange(0, 9)
+        compression_spinbox.setValue(self.settings.value("png_compression_level", 1, int))
+        compression_spinbox.valueChanged.connect(lambda value: self.settings.setValue("png_compression_level", value))
+        compression_layout.addWidget(compression_spinbox)
+
 
 
         # OCR-Layout zusammensetzen
         ocr_layout.addWidget(ocr_info)
         ocr_layout.addWidget(ocr_button)
         ocr_layout.addWidget(refresh_button)
+        ocr_layout.addWidget(memory_capture_checkbox)
+        ocr_layout.addWidget(archive_checkbox)
+        ocr_layout.addWidget(page_change_checkbox)
+        ocr_layout.addWidget(compact_checkbox)
+        ocr_layout.addLayout(compression_layout)
 
 
         # Add a refresh button to reload raid data
@@ -1288,7 +1582,8 @@ class EFTTracker(BorderlessMainWindow):
             if hasattr(self, 'log_text_edit'):
                 self.log_message(f"Found {len(raid_data_files)} raid data files", "python")
 
-            # Process each raid data file
+            # Read each raid data file, the raids are corrected together afterwards
+            raw_raids = []
             for file_path in raid_data_files:
                 try:
                     with open(file_path, 'r', encoding='utf-8') as f:
@@ -1298,10 +1593,10 @@ class EFTTracker(BorderlessMainWindow):
                             # Extract folder name (date & time) from path
                             folder_name = os.path.basename(os.path.dirname(file_path))
 
-                            # Process OCR data into raid info
+                            # Extract the raid info from the OCR data
                             raid = self.process_ocr_data(ocr_data, folder_name)
                             if raid:
-                                self.raids.append(raid)
+                                raw_raids.append(raid)
                                 if hasattr(self, 'log_text_edit'):
                                     self.log_message(f"Successfully loaded raid from {folder_name}", "python")
                         except json.JSONDecodeError as json_err:
@@ -1315,6 +1610,9 @@ class EFTTracker(BorderlessMainWindow):
                         self.log_message(f"Error reading file {file_path}: {str(file_err)}", "error")
                     continue
 
+            # One batch through the shared corrector, readings repeated across raids are corrected once
+            self.raids = self.correct_loaded_raids(raw_raids)
+
             # Sort raids by date (newest first)
             self.raids.sort(key=lambda x: x.get("date", ""), reverse=True)
 
@@ -1339,27 +1637,96 @@ class EFTTracker(BorderlessMainWindow):
 
                 self.log_message(error_details, "error")
 
-    def start_ocr(self):
-        try:
-            # Use the asset manager to get the correct path
-            exe_path = os.path.join(self.assets.base_path, "../Assets", "OCR.exe")
-
-            # Log the path for debugging
-            print(f"OCR executable path: {exe_path}")
+    def find_ocr_executable(self):
+        """Returns the path to OCR.exe, raises FileNotFoundError if it doesn't exist"""
+        # Use the asset manager to get the correct path
+        exe_path = os.path.join(self.assets.base_path, "../Assets", "OCR.exe")
+
+        # Log the path for debugging
+        print(f"OCR executable path: {exe_path}")
+        if hasattr(self, 'log_text_edit'):
+            self.log_message(f"OCR executable path: {exe_path}", "python")
+
+        # Check if the file exists
+        if not os.path.exists(exe_path):
+            # Try an alternative path if the first one fails
+            exe_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../Assets", "OCR.exe")
+            print(f"Trying alternative OCR path: {exe_path}")
             if hasattr(self, 'log_text_edit'):
-                self.log_message(f"OCR executable path: {exe_path}", "python")
+                self.log_message(f"Trying alternative OCR path: {exe_path}", "python")
 
-            # Check if the file exists
+            # Check if the alternative path exists
             if not os.path.exists(exe_path):
-                # Try an alternative path if the first one fails
-                exe_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../Assets", "OCR.exe")
-                print(f"Trying alternative OCR path: {exe_path}")
-                if hasattr(self, 'log_text_edit'):
-                    self.log_message(f"Trying alternative OCR path: {exe_path}", "python")
+                raise FileNotFoundError(f"OCR executable not found at: {exe_path}")
 
-                # Check if the alternative path exists
-                if not os.path.exists(exe_path):
-                    raise FileNotFoundError(f"OCR executable not found at: {exe_path}")
+        return exe_path
+
+    def ocr_service_alive(self):
+        """Checks whether the OCR service process started by this app is still running"""
+        return self.ocr_service_process is not None and self.ocr_service_process.poll() is None
+
+    def start_ocr_service(self):
+        """Start the background OCR service which keeps the OCR model loaded"""
+        try:
+            if self.ocr_service_alive():
+                self.log_message("OCR service already running", "python")
+                return
+
+            try:
+                command = [self.find_ocr_executable(), "--service"]
+            except FileNotFoundError:
+                # Running from source without a built OCR.exe
+                if getattr(sys, 'frozen', False):
+                    raise
+                command = [sys.executable, "-m", "src.ocr_service"]
+
+            # The service listens on this client's random address with its random key
+            self.ocr_service_process = subprocess.Popen(
+                command,
+                env=self.ocr_service_client.environment(),
+                creationflags=subprocess.CREATE_NO_WINDOW
+            )
+            self.log_message("OCR service started, loading OCR model in the background", "python")
+
+            self.ocr_service_ready = False
+            self.ocr_service_watcher = OCRServiceWatcher(self.ocr_service_client)
+            self.ocr_service_watcher.service_ready.connect(self.ocr_service_ready_changed)
+            self.ocr_service_watcher.start()
+
+        except Exception as e:
+            self.log_message(f"Error starting OCR service: {e}", "error")
+
+    def ocr_service_ready_changed(self, ready):
+        self.ocr_service_ready = ready
+        if ready:
+            self.log_message("OCR service ready", "python")
+        else:
+            self.log_message("OCR service did not become ready, raids are OCRed from their screenshots", "warning")
+
+    def ocr_service_usable(self):
+        """True if the started service accepted connections and is still running, checked without connecting"""
+        return self.ocr_service_ready and self.ocr_service_alive()
+
+    def start_ocr(self):
+        # Prefer the warm OCR service, it skips the model load of a new OCR process
+        if self.ocr_service_job is not None and self.ocr_service_job.isRunning():
+            self.log_message("OCR job is already running", "warning")
+            return
+
+        # The job waits for a service that is still loading on its own thread
+        if self.ocr_service_alive():
+            self.log_message("Sending OCR job to the OCR service", "python")
+            self.ocr_service_job = OCRServiceJob(self.ocr_service_client, "Raids new",
+                                                 self.ocr_data_dir, "Raids old")
+            self.ocr_service_job.message_received.connect(self.log_message)
+            self.ocr_service_job.raid_processed.connect(
+                lambda folder: self.log_message(f"OCR finished for raid: {folder}", "python"))
+            self.ocr_service_job.job_finished.connect(self.ocr_job_finished)
+            self.ocr_service_job.start()
+            return
+
+        try:
+            exe_path = self.find_ocr_executable()
 
             # Start the OCR process
             subprocess.Popen(exe_path)
@@ -1373,102 +1740,43 @@ class EFTTracker(BorderlessMainWindow):
             if hasattr(self, 'log_text_edit'):
                 self.log_text_edit.append(error_msg)
 
+    def ocr_job_finished(self, processed):
+        """Called when the OCR service has finished a job"""
+        self.log_message(f"OCR service processed {processed} raids", "python")
+        if processed:
+            self.reload_ocr_data()
+
     def process_ocr_data(self, ocr_data, folder_name):
-        """Process OCR data into raid info with corrections"""
+        """Extracts the uncorrected raid info from OCR data, see correct_loaded_raids"""
         try:
-            # Create OCR corrector
-            from ocr_corrector import OCRDataCorrector
-            corrector = OCRDataCorrector()
-
             # Extract information from OCR data
             status_info = ocr_data.get("Status", {})
             kill_list = ocr_data.get("KillList", {})
             raid_stats = ocr_data.get("RaidStatistics", {})
-            exp_info = ocr_data.get("ExperienceGained", {})
 
             # Create a log entry for debugging
             self.log_message(f"Processing OCR data for folder: {folder_name}", "python")
 
-            # Process and correct status
             # Handle both list and string cases for all extracted data
-            status_text = ""
-            if isinstance(status_info.get("Status"), list):
-                status_text = " ".join(status_info.get("Status", []))
-            elif isinstance(status_info.get("Status"), str):
-                status_text = status_info.get("Status", "")
-            status = corrector.correct_status(status_text) if status_text else "Unknown"
-
-
-            # Extract and correct time
-            time_text = ""
-            if isinstance(status_info.get("Timer"), list):
-                time_text = " ".join(status_info.get("Timer", []))
-            elif isinstance(status_info.get("Timer"), str):
-                time_text = status_info.get("Timer", "")
-            time = corrector.correct_time_format(time_text) if time_text else "Unknown"
-
-
-            # Extract and correct map
-            map_text = ""
-            if isinstance(raid_stats.get("map"), list):
-                map_text = " ".join(raid_stats.get("map", []))
-            elif isinstance(raid_stats.get("map"), str):
-                map_text = raid_stats.get("map", "")
-            map_name = corrector.correct_map_name(map_text) if map_text else "Unknown"
-
-
-            # Extract and correct experience
-            exp_text = ""
-            if isinstance(status_info.get("Experience"), list):
-                exp_text = " ".join(status_info.get("Experience", []))
-            elif isinstance(status_info.get("Experience"), str):
-                exp_text = status_info.get("Experience", "")
-            exp = corrector.correct_number(exp_text) if exp_text else 0
-
-
-            # Extract and correct level
-            level_text = ""
-            if isinstance(status_info.get("Level"), list):
-                level_text = " ".join(status_info.get("Level", []))
-            elif isinstance(status_info.get("Level"), str):
-                level_text = status_info.get("Level", "")
-            level = corrector.correct_number(level_text) if level_text else 0
-
-
-            self.log_message(f"Status: {status_text} → {status}", "data")
-            self.log_message(f"Time: {time_text} → {time}", "data")
-            self.log_message(f"Map: {map_text} → {map_name}", "data")
-            self.log_message(f"EXP: {exp_text} → {exp}", "data")
-            self.log_message(f"Level: {level_text} → {level}", "data")
-
-            # Process kill list with corrections
-            try:
-                corrected_kill_list = corrector.correct_kill_data(kill_list)
-                kills = len(corrected_kill_list) if corrected_kill_list else 0
-            except Exception as kill_error:
-                self.log_message(f"Error processing kill list: {str(kill_error)}", "error")
-                corrected_kill_list = {}
-                kills = 0
-
-            # Format date from folder name
-            date_formatted = corrector.correct_date_format("", folder_name)
-
-            # Create raid object with corrected data
-            raid = {
-                "date": date_formatted,
-                "status": status,
-                "map": map_name,
-                "kills": kills,
-                "exp": exp,
-                "level": level,
-                "time": time,
-                "kill_list": corrected_kill_list,
+            def text(section, name):
+                value = section.get(name)
+                if isinstance(value, list):
+                    return " ".join(value)
+                return value if isinstance(value, str) else ""
+
+            # Empty readings are corrected to "Unknown" or 0
+            return {
+                "date": "",
+                "status": text(status_info, "Status"),
+                "map": text(raid_stats, "map"),
+                "kills": 0,
+                "exp": text(status_info, "Experience"),
+                "level": text(status_info, "Level"),
+                "time": text(status_info, "Timer"),
+                "kill_list": kill_list if isinstance(kill_list, dict) else {},
                 "folder_name": folder_name
             }
 
-            self.log_message(f"Processed raid data with {kills} kills", "python")
-            return raid
-
         except Exception as e:
             import traceback
             error_msg = f"Error processing OCR data: {str(e)}\n{traceback.format_exc()}"
@@ -1477,6 +1785,22 @@ class EFTTracker(BorderlessMainWindow):
                 self.log_text_edit.append(error_msg)
             return None
 
+    def correct_loaded_raids(self, raw_raids):
+        """Corrects the raids extracted by process_ocr_data in one batch with the shared corrector"""
+        from src.ocr_corrector import correct_raids
+
+        raids = correct_raids(raw_raids)
+        for raw, raid in zip(raw_raids, raids):
+            raid["kills"] = len(raid["kill_list"])
+
+            self.log_message(f"Status: {raw['status']} → {raid['status']}", "data")
+            self.log_message(f"Time: {raw['time']} → {raid['time']}", "data")
+            self.log_message(f"Map: {raw['map']} → {raid['map']}", "data")
+            self.log_message(f"EXP: {raw['exp']} → {raid['exp']}", "data")
+            self.log_message(f"Level: {raw['level']} → {raid['level']}", "data")
+            self.log_message(f"Processed raid data with {raid['kills']} kills", "python")
+        return raids
+
     def initialize_eft_path(self):
         """Try to automatically detect and set the EFT logs path if not already set"""
         # Check if a log path is already configured
@@ -1548,6 +1872,19 @@ class EFTTracker(BorderlessMainWindow):
             except:
                 pass
 
+        self.screenshot_worker.stop()
+        if self.archive_compaction_job is not None:
+            self.archive_compaction_job.stop()
+
+        # Stop the OCR service started by this app
+        if self.ocr_service_alive():
+            self.ocr_service_client.shutdown()
+            try:
+                self.ocr_service_process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.ocr_service_process.terminate()
+        self.ocr_service_client.close()
+
         # Always call the parent class method
         super().closeEvent(event)
 
@@ -1,212 +1,314 @@
 import sys
 import os
-import cv2 as cv
-import easyocr
+import time
+
+# Start of the process, for the startup timings
+LAUNCH_TIME = time.perf_counter()
+
 from datetime import datetime
-import json
-import shutil
+import threading
+import multiprocessing
 from PyQt5.QtWidgets import (QApplication)
 from PyQt5.QtCore import pyqtSignal, QThread
 
 from src.ui.OCRCustomWindow import OCRCustomWindow
+from src.progress_channel import ProgressChannel
+
+# The OCR modules pull in OpenCV, NumPy and torch, they are imported on first use so the
+# window shows up without waiting for them
 
 
 class OCRWorker(QThread):
     """Thread for running OCR processing in background"""
-    progress_update = pyqtSignal(str)
-    progress_value = pyqtSignal(int)
+    # Log messages and progress value (-1 if unchanged), batched by the progress channel
+    progress_batch = pyqtSignal(list, int)
     processing_finished = pyqtSignal()
     processing_error = pyqtSignal(str)
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.reader = None
+        self.channel = ProgressChannel(self.progress_batch.emit)
+        # Created by load_engine on first use
+        self.engine = None
+        # Guards loading the engine and reader, which happens on the preload or the worker thread
+        self.load_lock = threading.RLock()
+        # Start of the process, the startup timings are logged relative to it
+        self.launch_time = time.perf_counter()
         self.data_dir = 'data'
         self.root_folder = 'Raids new'
         self.archive_folder = 'Raids old'
+        self.gpu = True
+        # Recognizer backend, see ocr_backends.BACKENDS
+        self.backend = "auto"
+        # Number of OCR worker processes, 1 processes all folders in this thread with the preloaded
+        # reader and the pipeline. More only pay off for large backlogs on the CPU, every process
+        # loads its own reader
+        self.worker_processes = 1
+        # Threads per worker process, None splits the CPU cores evenly
+        self.threads_per_process = None
+        # Answer repeated regions like map names from the on-disk OCR cache
+        self.use_cache = True
+        # Decode the next folders and save the finished ones while a folder is OCRed
+        self.pipelined = True
+        # Keep running and OCR raid folders as soon as they land in root_folder
+        self.watch = False
+        # Seconds between scans of root_folder where filesystem notifications are not available
+        self.watch_poll_interval = 1.0
 
     def run(self):
+        self.channel.start()
+        error = None
         try:
-            start_time = datetime.now()
-            self.progress_update.emit(f"Starting OCR processing at {start_time}")
-
-            # Initialize OCR reader
-            if self.reader is None:
-                self.progress_update.emit("Initializing EasyOCR reader (this might take a moment)...")
-                self.reader = easyocr.Reader(['en'], gpu=True)
-                self.progress_update.emit("EasyOCR reader initialized")
-
-            # Ensure directories exist
-            for directory in [self.data_dir, self.root_folder, self.archive_folder]:
-                if not os.path.exists(directory):
-                    os.makedirs(directory)
-                    self.progress_update.emit(f"Created directory: {directory}")
-
-            # Get subfolders sorted by creation time
-            subfolders = sorted(
-                [f.path for f in os.scandir(self.root_folder) if f.is_dir()],
-                key=lambda x: os.path.getctime(x)
-            )
-
-            if not subfolders:
-                self.progress_update.emit(f"No folders found in '{self.root_folder}'")
-                self.processing_finished.emit()
-                return
-
-            self.progress_update.emit(f"Found {len(subfolders)} folders to process")
-
-            # Process each subfolder
-            processed_count = 0
-            total_folders = len(subfolders)
-
-            for i, subfolder in enumerate(subfolders):
-                # Update progress
-                progress_percent = int((i / total_folders) * 100)
-                self.progress_value.emit(progress_percent)
-
-                if self.process_subfolder(subfolder):
-                    processed_count += 1
-
-            # Final progress update
-            self.progress_value.emit(100)
-
-            end_time = datetime.now()
-            time_delta = end_time - start_time
-            self.progress_update.emit(f"Total processing time: {time_delta}")
-            self.progress_update.emit(f"Processed {processed_count} of {total_folders} folders")
-
+            self.process()
+        except Exception as e:
+            error = str(e)
+        finally:
+            # The channel delivers the last messages before the UI hears that the run ended
+            self.channel.stop()
+            if self.engine is not None and self.engine.cache is not None:
+                self.engine.cache.close()
+                self.engine.cache = None
+
+        if error is None:
             self.processing_finished.emit()
+        else:
+            self.processing_error.emit(error)
+
+    def process(self):
+        """Runs the OCR of all raid folders, or watches root_folder if watch is set"""
+        start_time = datetime.now()
+        self.log(f"Starting OCR processing at {start_time}")
+        self.load_engine()
+        from src.ocr_engine import list_raid_folders
+        from src.ocr_cache import OCRResultCache
+
+        # Ensure directories exist
+        for directory in [self.data_dir, self.root_folder, self.archive_folder]:
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+                self.log(f"Created directory: {directory}")
+
+        # The cache connection has to be opened in this thread
+        if self.use_cache:
+            self.engine.cache = OCRResultCache(self.cache_path())
+
+        if self.watch:
+            self.watch_folders()
+            return
+
+        # Get subfolders sorted by creation time
+        subfolders = list_raid_folders(self.root_folder)
+
+        if not subfolders:
+            self.log(f"No folders found in '{self.root_folder}'")
+            return
+
+        self.log(f"Found {len(subfolders)} folders to process")
+
+        # Process each subfolder
+        total_folders = len(subfolders)
 
+        if self.worker_processes > 1 and total_folders > 1:
+            processed_count = self.process_subfolders_parallel(subfolders)
+        else:
+            processed_count = self.process_subfolders_serial(subfolders)
+
+        # Final progress update
+        self.set_progress(100)
+
+        end_time = datetime.now()
+        time_delta = end_time - start_time
+        self.log(f"Total processing time: {time_delta}")
+        self.log(f"Processed {processed_count} of {total_folders} folders")
+
+    def log(self, message):
+        """Queues a log message for the UI, never blocks on the GUI thread"""
+        self.channel.log(message)
+
+    def set_progress(self, value):
+        """Queues the progress bar value for the UI"""
+        self.channel.set_progress(value)
+
+    def cache_path(self):
+        """Location of the OCR result cache"""
+        return os.path.join(self.data_dir, "ocr_cache.sqlite")
+
+    def load_engine(self):
+        """Creates the OCR engine if it doesn't exist yet"""
+        with self.load_lock:
+            if self.engine is None:
+                from src.ocr_engine import RaidOCREngine
+                self.engine = RaidOCREngine(log=self.log)
+            return self.engine
+
+    def load_reader(self):
+        """Initializes the OCR reader of this thread's engine if it isn't loaded yet"""
+        with self.load_lock:
+            engine = self.load_engine()
+            if engine.reader is None:
+                self.log("Initializing EasyOCR reader (this might take a moment)...")
+                start = time.perf_counter()
+                from src.ocr_engine import create_reader
+                engine.reader = create_reader(self.gpu, self.backend)
+                loaded = time.perf_counter()
+                engine.warm_up()
+                self.log(f"EasyOCR reader initialized in {loaded - start:.1f}s, first inference done "
+                         f"{time.perf_counter() - self.launch_time:.1f}s after launch")
+
+    def preload(self):
+        """Loads the reader on a background thread, so the first OCR run doesn't have to wait for it"""
+        self.channel.flush()
+        threading.Thread(target=self.preload_reader, name="OCR preload", daemon=True).start()
+
+    def preload_reader(self):
+        try:
+            self.load_reader()
         except Exception as e:
-            self.processing_error.emit(str(e))
+            self.log(f"Preloading the OCR reader failed: {e}")
+        self.channel.flush()
+
+    def process_subfolders_serial(self, subfolders):
+        """Process all subfolders one after another in this thread"""
+        self.load_reader()
+
+        if self.pipelined:
+            return self.process_subfolders_pipelined(subfolders)
+
+        processed_count = 0
+        for i, subfolder in enumerate(subfolders):
+            # Update progress
+            progress_percent = int((i / len(subfolders)) * 100)
+            self.set_progress(progress_percent)
+
+            if self.process_subfolder(subfolder):
+                processed_count += 1
+
+        return processed_count
+
+    def process_subfolders_pipelined(self, subfolders):
+        """
+        Process the subfolders in this thread's engine while the next folders are decoded and
+        the finished ones are saved and archived on background threads
+        """
+        valid_subfolders = [subfolder for subfolder in subfolders if self.has_expected_files(subfolder)]
+        if not valid_subfolders:
+            return 0
+
+        from src.ocr_pipeline import RaidPipeline
+        pipeline = RaidPipeline(self.engine, self.data_dir, self.archive_folder, self.log,
+                                should_stop=self.isInterruptionRequested)
+        processed_count = pipeline.run(
+            valid_subfolders, lambda done, total: self.set_progress(int(done / total * 100)))
+
+        for line in pipeline.summary().splitlines():
+            self.log(line)
+        return processed_count
+
+    def watch_folders(self):
+        """
+        Processes the raid folders in root_folder as soon as their screenshots are complete,
+        until requestInterruption() is called
+        """
+        # Load the reader up front so the first raid is processed without delay
+        self.load_reader()
+
+        from src.raid_watcher import RaidFolderWatcher
+        watcher = RaidFolderWatcher(self.root_folder, self.watch_poll_interval, self.log)
+        processed_count = 0
+        try:
+            while not self.isInterruptionRequested():
+                for subfolder in watcher.ready_folders():
+                    if self.isInterruptionRequested():
+                        break
+                    try:
+                        if self.process_subfolder(subfolder):
+                            processed_count += 1
+                    except Exception as e:
+                        self.log(f"Error processing folder {subfolder}: {e}")
+                watcher.wait()
+        finally:
+            watcher.close()
+
+        self.log(f"Stopped watching, processed {processed_count} folders")
+        return processed_count
+
+    def process_subfolders_parallel(self, subfolders):
+        """Process the subfolders on a pool of worker processes with one warm reader each"""
+        valid_subfolders = [subfolder for subfolder in subfolders if self.has_expected_files(subfolder)]
+        if not valid_subfolders:
+            return 0
+
+        from src.ocr_pool import OCRProcessPool
+        processes = min(self.worker_processes, len(valid_subfolders))
+        pool = OCRProcessPool(processes, self.threads_per_process, self.gpu,
+                              self.cache_path() if self.use_cache else None, self.data_dir, self.backend)
+        self.log(f"Starting {processes} OCR worker processes "
+                 f"with {pool.threads_per_process} threads each...")
+
+        processed_count = 0
+        for i, (subfolder, all_data, messages, error, seconds) in enumerate(pool.map_folders(valid_subfolders)):
+            self.log(f"Processed folder: {subfolder} ({seconds:.1f}s)")
+            for message in messages:
+                self.log(message)
+
+            if error is not None:
+                self.log(f"Error processing folder {subfolder}: {error}")
+            else:
+                self.save_and_archive(subfolder, all_data)
+                processed_count += 1
+
+            self.set_progress(int(((i + 1) / len(valid_subfolders)) * 100))
+
+        return processed_count
+
+    def has_expected_files(self, subfolder):
+        """Checks that a raid folder contains its 4 screenshots"""
+        png_files = [f for f in os.listdir(subfolder) if f.endswith('.png')]
+        if len(png_files) != 4:
+            self.log(f"Skipping folder {subfolder}: Expected 4 PNG files, found {len(png_files)}")
+            return False
+        return True
 
     def process_subfolder(self, subfolder):
         """Process a single subfolder containing PNG files"""
-        png_files = [f for f in os.listdir(subfolder) if f.endswith('.png')]
-
-        if len(png_files) == 4:
-            folder_name = os.path.basename(subfolder)
-            data_path = os.path.join(self.data_dir, folder_name)
-
-            if not os.path.exists(data_path):
-                os.makedirs(data_path)
-
-            self.progress_update.emit(f"Processing folder: {subfolder}")
-
-            # Load PNG files
-            png_paths = [os.path.join(subfolder, png) for png in sorted(png_files)]
-            images = [cv.imread(png) for png in png_paths]
-
-            # Process each image
-            all_data = {
-                "Status": self.process_image0(images[0]),
-                "KillList": self.process_image1(images[1]),
-                "RaidStatistics": self.process_image2(images[2]),
-                "ExperienceGained": self.process_image3(images[3])
-            }
-
-            # Save data to JSON
-            json_file = os.path.join(data_path, "raid_data.json")
-            self.save_to_json(all_data, json_file)
-            self.progress_update.emit(f"All data saved to: {json_file}")
-
-            # Move processed folder to archive
-            try:
-                target_folder = os.path.join(self.archive_folder, folder_name)
-                shutil.move(subfolder, target_folder)
-                self.progress_update.emit(f"Folder moved to: {target_folder}")
-            except Exception as e:
-                self.progress_update.emit(f"Error moving folder {subfolder}: {e}")
-
-            return True
-        else:
-            self.progress_update.emit(f"Skipping folder {subfolder}: Expected 4 PNG files, found {len(png_files)}")
+        if not self.has_expected_files(subfolder):
             return False
 
-    def save_to_json(self, data_dict, filename):
-        """Save dictionary to JSON file"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data_dict, f, ensure_ascii=False, indent=4)
-
-    def process_image0(self, img0):
-        """Process Status Image OCR"""
-        # Crop regions of interest (ROI)
-        regions = {
-            "Next": (1257, 1309, 1221, 1348),
-            "Status": (865, 900, 1080, 1313),
-            "Timer": (880, 910, 1387, 1537),
-            "Experience": (975, 1017, 1100, 1420),
-            "Names": (785, 823, 840, 1700),
-            "Level": (190, 270, 1026, 1145)
-        }
-
-        results = {}
-        for name, (y1, y2, x1, x2) in regions.items():
-            roi = img0[y1:y2, x1:x2]
-            text = self.reader.readtext(roi, detail=0)
-            results[name] = text
-            self.progress_update.emit(f"{name}: {text}")
-
-        return results
-
-    def process_image1(self, img1):
-        """Process Kill List OCR with detailed sub-regions"""
-        rows = {}
-
-        for i in range(1, 10):
-            y_start = 334 + (i - 1) * 80
-            y_end = y_start + 65
-
-            # Definieren der einzelnen Spalten innerhalb jeder Zeile
-            regions = {
-                "No": (y_start, y_end, 648, 723),
-                "Time": (y_start, y_end, 723, 880),
-                "Player": (y_start, y_end, 880, 1260),
-                "LVL": (y_start, y_end, 1260, 1334),
-                "Faction": (y_start, y_end, 1334, 1487),
-                "Status": (y_start, y_end, 1487, 1930)
-            }
-
-            row_data = {}
-            for name, (y1, y2, x1, x2) in regions.items():
-                roi = img1[y1:y2, x1:x2]
-                text_list = self.reader.readtext(roi, detail=0)
-
-                # Zusammenführen aller erkannten Strings zu einem einzigen String
-                if text_list:
-                    combined_text = " ".join(text_list)
-                    row_data[name] = combined_text
-                else:
-                    row_data[name] = ""
-
-            row_name = f"row{i}"
-            rows[row_name] = row_data
-
-            # Nur ausgeben, wenn tatsächlich ein Spieler erkannt wurde
-            if row_data["Player"]:
-                self.progress_update.emit(f"Kill {i}: {row_data['Player']} ({row_data['Faction']})")
-
-        return rows
-
-    def process_image2(self, img2):
-        """Process Raid Statistics OCR"""
-        map_roi = img2[142:173, 1120:1400]
-        map_text = self.reader.readtext(map_roi, detail=0)
-        self.progress_update.emit(f"Map: {map_text}")
-
-        return {"map": map_text}
-
-    def process_image3(self, img3):
-        """Process Experience Gained OCR"""
-        elimination_roi = img3[484:513, 882:1062]
-        elimination_text = self.reader.readtext(elimination_roi, detail=0)
-        self.progress_update.emit(f"Eliminations: {elimination_text}")
-
-        return {"Eliminations": elimination_text}
+        self.log(f"Processing folder: {subfolder}")
+
+        # Process each image, resuming from the journal if an earlier run was interrupted
+        from src.ocr_journal import RaidJournal
+        all_data = self.engine.process_folder(subfolder, RaidJournal(self.data_dir, subfolder))
+
+        self.save_and_archive(subfolder, all_data)
+        return True
+
+    def save_and_archive(self, subfolder, all_data):
+        """Saves the OCR results of a raid and moves its screenshots to the archive"""
+        from src.ocr_engine import save_and_archive
+        save_and_archive(subfolder, all_data, self.data_dir, self.archive_folder, self.log)
 
 
 if __name__ == "__main__":
+    # Required for the OCR worker processes when running as a frozen executable
+    multiprocessing.freeze_support()
+
+    # OCR.exe --service runs the headless OCR service for the EFT Tracker instead of the window
+    if "--service" in sys.argv:
+        from src.ocr_service import main as service_main
+        service_main()
+        sys.exit(0)
+
+    # OCR.exe --batch [options] OCRs the raid folders without a window, see src/ocr_cli.py
+    if "--batch" in sys.argv:
+        from src.ocr_cli import main as batch_main
+        sys.exit(batch_main([arg for arg in sys.argv[1:] if arg != "--batch"]))
+
     app = QApplication(sys.argv)
     window = OCRCustomWindow()
     window.show()
+    window.ocr_worker.launch_time = LAUNCH_TIME
+    window.ocr_worker.log(f"Window ready {time.perf_counter() - LAUNCH_TIME:.2f}s after launch")
+    # Load the OCR model in the background while the window is already usable
+    window.ocr_worker.preload()
     sys.exit(app.exec_())
\ No newline at end of file
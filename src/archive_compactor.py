@@ -0,0 +1,304 @@
+"""
+Compaction of the screenshot archive in 'Raids old'.
+
+Every archived raid is a folder with four full-resolution PNGs. The compactor repacks it
+into one uncompressed tar next to it, '<folder name>.tar', holding:
+
+  - index.json: the original file names and sizes and the members of every page
+  - pageN/rows_Y1_Y2.webp: the grayscale ROI stripes of page N in full resolution, as lossless
+    WebP. They are exactly what the ROI decoder reads from the PNG, so a packed raid can be
+    OCRed again with the same results (RaidOCREngine.process_folder accepts the tar)
+  - pageN/preview.webp: the whole page at a quarter of the size, for looking at it
+
+The pack is written under a temporary name, read back and compared with the original stripes
+before it replaces the folder, so an interrupted run leaves either the folder or the pack and
+the next run continues where it stopped. Raids are compacted one at a time with pauses in
+between, so the compactor only uses a fraction of one core.
+
+Usage:
+    python -m src.archive_compactor [--archive DIR] [--min-age HOURS] [--duty FRACTION]
+"""
+import os
+import io
+import json
+import time
+import shutil
+import tarfile
+import argparse
+import threading
+
+import cv2 as cv
+import numpy as np
+
+from src.roi_image_loader import StripeImage, load_roi_image, scale_stripes
+
+PACK_SUFFIX = ".tar"
+PACK_VERSION = 1
+
+# Previews are downscaled by this factor and stored as lossy WebP
+PREVIEW_SCALE = 4
+PREVIEW_QUALITY = 80
+
+# OpenCV writes lossless WebP for qualities above 100
+LOSSLESS_WEBP = [cv.IMWRITE_WEBP_QUALITY, 101]
+
+# Raid folders changed more recently than this are left alone, the screenshots may still be written
+MIN_AGE_SECONDS = 3600
+
+# Fraction of the time spent compacting, the rest is spent waiting between raids
+DUTY_CYCLE = 0.2
+
+
+def pack_path(folder):
+    return folder.rstrip("/\\") + PACK_SUFFIX
+
+
+def is_pack(path):
+    return path.endswith(PACK_SUFFIX) and os.path.isfile(path)
+
+
+def encode_webp(image, params):
+    ok, data = cv.imencode(".webp", image, params)
+    if not ok:
+        raise ValueError("WebP encoding failed")
+    return data.tobytes()
+
+
+def add_member(tar, name, data):
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(time.time())
+    tar.addfile(info, io.BytesIO(data))
+
+
+def compact_raid(folder):
+    """
+    Packs the four screenshots of a raid folder into '<folder>.tar' and deletes the folder
+    Returns (original bytes, packed bytes)
+    """
+    png_files = sorted(f for f in os.listdir(folder) if f.endswith('.png'))
+    original_bytes = sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder))
+    index = {"version": PACK_VERSION, "folder_name": os.path.basename(folder.rstrip("/\\")), "pages": []}
+    stripes = []
+
+    temp_path = pack_path(folder) + ".part"
+    with tarfile.open(temp_path, 'w') as tar:
+        for page, png in enumerate(png_files):
+            path = os.path.join(folder, png)
+            image = load_roi_image(path, page)
+            stripes.append(image.stripes)
+            height, width = image.shape
+            entry = {"file": png, "width": width, "height": height, "stripes": []}
+
+            for y1, y2, array in image.stripes:
+                member = f"page{page + 1}/rows_{y1}_{y2}.webp"
+                add_member(tar, member, encode_webp(array, LOSSLESS_WEBP))
+                entry["stripes"].append({"y1": y1, "y2": y2, "member": member})
+
+            full = cv.imread(path)
+            preview = cv.resize(full, (width // PREVIEW_SCALE, height // PREVIEW_SCALE), interpolation=cv.INTER_AREA)
+            entry["preview"] = f"page{page + 1}/preview.webp"
+            add_member(tar, entry["preview"], encode_webp(preview, [cv.IMWRITE_WEBP_QUALITY, PREVIEW_QUALITY]))
+            index["pages"].append(entry)
+
+        add_member(tar, "index.json", json.dumps(index, ensure_ascii=False, indent=4).encode('utf-8'))
+
+    # The folder is only deleted once the pack holds exactly the same ROIs
+    try:
+        verify_pack(temp_path, stripes)
+    except Exception:
+        os.remove(temp_path)
+        raise
+
+    os.replace(temp_path, pack_path(folder))
+    shutil.rmtree(folder)
+    return original_bytes, os.path.getsize(pack_path(folder))
+
+
+def verify_pack(path, stripes):
+    """Raises ValueError unless the pack holds exactly the given ROI stripes, one list per page"""
+    packed = load_pack_images(path)
+    if len(packed) != len(stripes):
+        raise ValueError(f"The pack holds {len(packed)} pages instead of {len(stripes)}")
+    for page, image in enumerate(packed):
+        if len(image.stripes) != len(stripes[page]):
+            raise ValueError(f"Page {page + 1} holds {len(image.stripes)} stripes instead of {len(stripes[page])}")
+        for (y1, y2, original), (packed_y1, packed_y2, restored) in zip(stripes[page], image.stripes):
+            if (y1, y2) != (packed_y1, packed_y2) or not np.array_equal(original, restored):
+                raise ValueError(f"Rows {y1}-{y2} of page {page + 1} differ after packing")
+
+
+def pack_matches_folder(folder):
+    """True if the pack of a raid folder holds exactly the ROIs of the folder's screenshots"""
+    try:
+        with tarfile.open(pack_path(folder), 'r') as tar:
+            files = [entry["file"] for entry in read_index(tar)["pages"]]
+        if sorted(f for f in os.listdir(folder) if f.endswith('.png')) != files:
+            return False
+        verify_pack(pack_path(folder), [load_roi_image(os.path.join(folder, f), page).stripes
+                                        for page, f in enumerate(files)])
+    except Exception:
+        return False
+    return True
+
+
+def read_index(tar):
+    return json.loads(tar.extractfile("index.json").read().decode('utf-8'))
+
+
+def read_member(tar, name, flags):
+    data = np.frombuffer(tar.extractfile(name).read(), dtype=np.uint8)
+    return cv.imdecode(data, flags)
+
+
+def load_pack_images(path, scales=(1, 1, 1, 1), pages=None):
+    """
+    Loads the ROI stripes of a packed raid in page order, like roi_image_loader.load_raid_images
+    Only the given pages are decoded if pages is set, the others are None
+    """
+    with tarfile.open(path, 'r') as tar:
+        index = read_index(tar)
+        images = []
+        for page, entry in enumerate(index["pages"]):
+            if pages is not None and page not in pages:
+                images.append(None)
+                continue
+            stripes = [(stripe["y1"], stripe["y2"], read_member(tar, stripe["member"], cv.IMREAD_GRAYSCALE))
+                       for stripe in entry["stripes"]]
+            images.append(StripeImage(entry["height"], entry["width"], scale_stripes(stripes, scales[page]),
+                                      scales[page]))
+    return images
+
+
+def render_pages(path):
+    """
+    Rebuilds viewable full-size pages of a packed raid: the upscaled preview with the
+    original ROI stripes on top
+    Returns [(original file name, BGR image), ...]
+    """
+    with tarfile.open(path, 'r') as tar:
+        index = read_index(tar)
+        pages = []
+        for entry in index["pages"]:
+            preview = read_member(tar, entry["preview"], cv.IMREAD_COLOR)
+            page = cv.resize(preview, (entry["width"], entry["height"]), interpolation=cv.INTER_LINEAR)
+            for stripe in entry["stripes"]:
+                gray = read_member(tar, stripe["member"], cv.IMREAD_GRAYSCALE)
+                page[stripe["y1"]:stripe["y2"]] = cv.cvtColor(gray, cv.COLOR_GRAY2BGR)
+            pages.append((entry["file"], page))
+    return pages
+
+
+def extract_pages(path, folder):
+    """Writes the rebuilt pages of a packed raid as PNGs into folder, under their original names"""
+    os.makedirs(folder, exist_ok=True)
+    for name, page in render_pages(path):
+        cv.imwrite(os.path.join(folder, name), page)
+    return folder
+
+
+def compactable(folder):
+    """True if the folder holds exactly the four screenshots of a raid"""
+    files = os.listdir(folder)
+    return len(files) == 4 and all(f.endswith('.png') for f in files)
+
+
+class ArchiveCompactor:
+    """Compacts the raid folders of an archive one after another, in the background"""
+
+    def __init__(self, archive_folder, min_age=MIN_AGE_SECONDS, duty_cycle=DUTY_CYCLE, log=None):
+        if not 0 < duty_cycle <= 1:
+            raise ValueError(f"The duty cycle must be greater than 0 and at most 1, not {duty_cycle}")
+        self.archive_folder = archive_folder
+        self.min_age = min_age
+        self.duty_cycle = duty_cycle
+        self.log = log or print
+        # Set to stop after the raid being compacted
+        self.stop_event = threading.Event()
+        self.compacted = 0
+        self.original_bytes = 0
+        self.packed_bytes = 0
+
+    def pending_folders(self):
+        """Raid folders old enough to be compacted, oldest first"""
+        if not os.path.isdir(self.archive_folder):
+            return []
+        now = time.time()
+        folders = []
+        for name in os.listdir(self.archive_folder):
+            folder = os.path.join(self.archive_folder, name)
+            if not os.path.isdir(folder) or now - os.path.getmtime(folder) < self.min_age:
+                continue
+            if os.path.exists(pack_path(folder)):
+                # Interrupted after the pack was renamed, the folder goes once the pack matches it
+                if pack_matches_folder(folder):
+                    shutil.rmtree(folder)
+                else:
+                    self.log(f"Leaving {folder}: {pack_path(folder)} exists but does not match it")
+                continue
+            if compactable(folder):
+                folders.append(folder)
+        return sorted(folders, key=os.path.getmtime)
+
+    def run(self):
+        """Compacts all pending raid folders, returns the number of compacted raids"""
+        # Leftovers of an interrupted run are written again
+        if os.path.isdir(self.archive_folder):
+            for name in os.listdir(self.archive_folder):
+                if name.endswith(PACK_SUFFIX + ".part"):
+                    os.remove(os.path.join(self.archive_folder, name))
+
+        for folder in self.pending_folders():
+            if self.stop_event.is_set():
+                break
+            start = time.perf_counter()
+            try:
+                original_bytes, packed_bytes = compact_raid(folder)
+            except Exception as e:
+                self.log(f"Could not compact {folder}: {e}")
+                continue
+            self.compacted += 1
+            self.original_bytes += original_bytes
+            self.packed_bytes += packed_bytes
+
+            # Throttle: wait long enough that compacting takes duty_cycle of the time
+            seconds = time.perf_counter() - start
+            self.stop_event.wait(seconds * (1 / self.duty_cycle - 1))
+
+        if self.compacted:
+            self.log(self.stats())
+        return self.compacted
+
+    def stop(self):
+        self.stop_event.set()
+
+    def stats(self):
+        return (f"Compacted {self.compacted} raids in '{self.archive_folder}': "
+                f"{self.original_bytes / 1e6:.1f} MB -> {self.packed_bytes / 1e6:.1f} MB")
+
+
+def duty_fraction(text):
+    """argparse type of --duty, a fraction greater than 0 and at most 1"""
+    value = float(text)
+    if not 0 < value <= 1:
+        raise argparse.ArgumentTypeError(f"must be greater than 0 and at most 1, not {text}")
+    return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive", default="Raids old", help="folder with the archived raid folders")
+    parser.add_argument("--min-age", type=float, default=MIN_AGE_SECONDS / 3600,
+                        help="only compact raids older than this many hours")
+    parser.add_argument("--duty", type=duty_fraction, default=1.0, help="fraction of the time spent compacting")
+    args = parser.parse_args(argv)
+
+    compactor = ArchiveCompactor(args.archive, args.min_age * 3600, args.duty)
+    try:
+        compactor.run()
+    except KeyboardInterrupt:
+        compactor.log(f"Interrupted, {compactor.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Fuzzy matching of OCR readings against the canonical vocabularies of the corrector.
+
+Each vocabulary is indexed in a BK-tree over the Levenshtein distance, so a lookup only
+visits the words the triangle inequality can't rule out. Readings and vocabulary are
+normalized first (lower case, no punctuation, digits and letter pairs OCR mixes up folded),
+and a match is only accepted within a distance that grows with the length of the reading
+and is unique, so short words like KIA and MIA are never guessed from each other.
+"""
+import re
+
+# Longest edit distance accepted for any reading
+MAX_DISTANCE = 3
+
+# One edit is allowed per this many characters of the normalized reading
+CHARACTERS_PER_EDIT = 3
+
+# Characters and pairs OCR reads for one another, folded before matching
+OCR_CONFUSIONS = [("\\/", "v"), ("vv", "w"), ("0", "o"), ("1", "l"), ("2", "z"), ("5", "s"), ("8", "b")]
+
+NON_WORD = re.compile(r"[^a-z ]+")
+SPACES = re.compile(r"\s+")
+
+
+def normalize(text):
+    """Lower case text with the OCR confusions folded and only letters and single spaces"""
+    text = text.lower()
+    for read, meant in OCR_CONFUSIONS:
+        text = text.replace(read, meant)
+    return SPACES.sub(" ", NON_WORD.sub("", text)).strip()
+
+
+def levenshtein(a, b):
+    """Edit distance of two strings"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def allowed_distance(text):
+    return min(MAX_DISTANCE, max(1, len(text) // CHARACTERS_PER_EDIT))
+
+
+class BKTree:
+    """Burkhard-Keller tree of words under the Levenshtein distance"""
+
+    def __init__(self, words=()):
+        # Nodes are [word, {distance: child node}]
+        self.root = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        if self.root is None:
+            self.root = [word, {}]
+            return
+        node = self.root
+        while True:
+            distance = levenshtein(word, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [word, {}]
+                return
+            node = child
+
+    def search(self, word, max_distance):
+        """Returns [(distance, word), ...] of all words within max_distance, closest first"""
+        if self.root is None:
+            return []
+        found = []
+        stack = [self.root]
+        while stack:
+            node_word, children = stack.pop()
+            distance = levenshtein(word, node_word)
+            if distance <= max_distance:
+                found.append((distance, node_word))
+            # Only children whose edge is within max_distance of distance can hold matches
+            for edge, child in children.items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        return sorted(found)
+
+
+class VocabularyMatcher:
+    """
+    Matches readings against canonical values
+    aliases maps further spellings (e.g. "Streets of Tarkov") to a canonical value
+    """
+
+    def __init__(self, values, aliases=None):
+        # Normalized spelling -> canonical value
+        self.spellings = {normalize(value): value for value in values}
+        for alias, value in (aliases or {}).items():
+            self.spellings[normalize(alias)] = value
+        self.tree = BKTree(self.spellings)
+
+    def match(self, text):
+        """
+        Returns (canonical value, edit distance) of the closest spelling, or (None, None)
+        if no spelling is close enough or the closest ones belong to different values
+        """
+        key = normalize(text)
+        if not key:
+            return None, None
+        if key in self.spellings:
+            return self.spellings[key], 0
+
+        found = self.tree.search(key, allowed_distance(key))
+        if not found:
+            return None, None
+        best = found[0][0]
+        values = {self.spellings[spelling] for distance, spelling in found if distance == best}
+        if len(values) > 1:
+            return None, None
+        return values.pop(), best
+
+
+MAP_MATCHER = VocabularyMatcher(
+    ["Factory", "Interchange", "Customs", "Woods", "Lighthouse", "Reserve", "Shoreline", "Streets", "Ground Zero",
+     "The Lab"],
+    {"Streets of Tarkov": "Streets", "Laboratory": "The Lab", "Lab": "The Lab"})
+
+FACTION_MATCHER = VocabularyMatcher(["USEC", "BEAR", "Scav", "Boss", "Rogue", "Raider"])
+
+STATUS_MATCHER = VocabularyMatcher(["Survived", "KIA", "MIA", "Killed in Action", "Missing in Action", "Killed",
+                                    "Missing"])
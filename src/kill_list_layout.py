@@ -0,0 +1,104 @@
+"""
+Projection-profile detection of the kill list cells that contain text.
+
+Text is found by its strong horizontal gradients, which works on any row background. The
+horizontal projection of the edge pixels over the kill list area gives one text line per
+filled row. Inside a line, the vertical projection gives the text segments, and each segment
+goes to the column whose nominal x range contains its center. Every cell is cropped to the
+extent of its text plus a small padding, and blank cells are not returned at all.
+
+Lines are numbered by the nominal row they are closest to, so the layout may shift by a
+few pixels in any direction without changing the row and column names.
+"""
+import cv2 as cv
+import numpy as np
+
+from src.ocr_regions import (KILL_LIST_AREA, KILL_LIST_COLUMNS, KILL_LIST_FIRST_ROW_Y, KILL_LIST_ROW_PITCH,
+                             KILL_LIST_ROW_HEIGHT, KILL_LIST_ROW_COUNT)
+
+# A pixel is a text edge if it differs this much from its right neighbour
+EDGE_MAGNITUDE = 40
+
+# Pixel rows of the area with fewer edge pixels are empty
+MIN_LINE_EDGES = 2
+
+# Lines lower than this are specks, not text
+MIN_LINE_HEIGHT = 6
+
+# Runs separated by at most this many empty pixels belong to the same line or segment
+LINE_GAP = 4
+SEGMENT_GAP = 4
+
+# Pixels added around the text extent of a cell
+CELL_PADDING = 6
+
+
+def runs(mask, max_gap):
+    """Returns the (start, end) ranges of True in a 1D mask, merging runs separated by at most max_gap"""
+    indices = np.flatnonzero(mask)
+    if not indices.size:
+        return []
+    breaks = np.flatnonzero(np.diff(indices) > max_gap + 1)
+    starts = np.concatenate(([indices[0]], indices[breaks + 1]))
+    ends = np.concatenate((indices[breaks], [indices[-1]])) + 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+
+def column_at(x):
+    """Name of the kill list column containing pixel column x, None outside the grid"""
+    for name, (x1, x2) in KILL_LIST_COLUMNS.items():
+        if x1 <= x < x2:
+            return name
+    return None
+
+
+def detect_kill_list_cells(img):
+    """
+    Finds the kill list cells with text on the kill list screenshot (BGR, grayscale or ROI stripes)
+    Returns {(row, column name): (y1, y2, x1, x2)}, or None if the text doesn't fit the kill
+    list layout, e.g. on a different page or background
+    """
+    area_y1, area_y2, area_x1, area_x2 = KILL_LIST_AREA
+    area = img[area_y1:area_y2, area_x1:area_x2]
+    if area.ndim == 3:
+        area = cv.cvtColor(area, cv.COLOR_BGR2GRAY)
+    edges = np.abs(np.diff(area.astype(np.int16), axis=1)) > EDGE_MAGNITUDE
+
+    first_row_center = KILL_LIST_FIRST_ROW_Y + KILL_LIST_ROW_HEIGHT / 2
+    extents = {}
+    lines = {}
+    for y1, y2 in runs(edges.sum(axis=1) >= MIN_LINE_EDGES, LINE_GAP):
+        if y2 - y1 < MIN_LINE_HEIGHT:
+            continue
+        if y2 - y1 > KILL_LIST_ROW_HEIGHT:
+            return None
+
+        row = round((area_y1 + (y1 + y2) / 2 - first_row_center) / KILL_LIST_ROW_PITCH) + 1
+        if not 1 <= row <= KILL_LIST_ROW_COUNT or row in lines:
+            return None
+        lines[row] = (y1, y2)
+
+        for x1, x2 in runs(edges[y1:y2].any(axis=0), SEGMENT_GAP):
+            column = column_at(area_x1 + (x1 + x2) // 2)
+            if column is None:
+                continue
+            extent = extents.get((row, column))
+            extents[(row, column)] = (x1, x2) if extent is None else (min(extent[0], x1), max(extent[1], x2))
+
+    # Rows are filled from the top and the row number may be shown for rows without a kill,
+    # so the list ends at the first row without any other column
+    rows = set()
+    for row in range(1, KILL_LIST_ROW_COUNT + 1):
+        if not any(key[0] == row and key[1] != "No" for key in extents):
+            break
+        rows.add(row)
+
+    height, width = img.shape[:2]
+    cells = {}
+    for (row, column), (x1, x2) in sorted(extents.items()):
+        if row not in rows:
+            continue
+        y1, y2 = lines[row]
+        cells[(row, column)] = (max(0, area_y1 + y1 - CELL_PADDING), min(height, area_y1 + y2 + CELL_PADDING),
+                                max(0, area_x1 + x1 - CELL_PADDING), min(width, area_x1 + x2 + 1 + CELL_PADDING))
+    return cells
@@ -0,0 +1,137 @@
+"""
+Closed-vocabulary classifier for the map name on the raid statistics screenshot.
+
+The map is always one of the known maps (the Assets/Maps/*_Banner.png names), so instead
+of reading the text, the map ROI is compared against one template per spelling of every
+map: rendered from the game font up front, and learned from the screenshot itself whenever
+the OCR fallback reads a map name exactly and confidently. The text line is normalized to a fixed height and compared
+by normalized cross-correlation after scaling to the template's width. Maps without a banner,
+like Reserve, are unknown to the classifier and always go to the OCR.
+"""
+import os
+import cv2 as cv
+import numpy as np
+
+from src.digit_recognizer import binarize_text, correlation
+
+# How the game may spell a map, by banner name
+MAP_DISPLAY_NAMES = {
+    "Streets": ["Streets of Tarkov", "Streets"],
+    "The Lab": ["The Lab", "Laboratory"],
+}
+
+# Height text lines are normalized to before comparing
+LINE_HEIGHT = 32
+
+# Font size the templates are rendered at
+RENDER_SIZE = 64
+
+# Screenshot templates kept per map, the first ones already cover the game's rendering
+MAX_LEARNED_TEMPLATES = 3
+
+# Templates whose width differs more than this from the ROI's text line are not compared
+MAX_WIDTH_DIFFERENCE = 0.25
+
+
+def known_maps(maps_dir):
+    """Returns the map names from the *_Banner.png files of the maps asset folder"""
+    if not os.path.isdir(maps_dir):
+        return []
+    return sorted(f[:-len("_Banner.png")] for f in os.listdir(maps_dir) if f.endswith("_Banner.png"))
+
+
+def normalize_line(gray):
+    """
+    Crops a grayscale image to its text and scales it to LINE_HEIGHT, text bright on black
+    Returns None for crops without text
+    """
+    if int(gray.max()) - int(gray.min()) < 40:
+        return None
+
+    mask, text_bright = binarize_text(gray)
+    ys, xs = np.nonzero(mask)
+    line = text_bright[ys.min():ys.max() + 1, xs.min():xs.max() + 1]
+    width = max(int(round(line.shape[1] * LINE_HEIGHT / line.shape[0])), 1)
+    return cv.resize(line, (width, LINE_HEIGHT), interpolation=cv.INTER_AREA).astype(np.float32)
+
+
+def render_line(text, font):
+    """Renders a text line with the given Pillow font and normalizes it"""
+    from PIL import Image, ImageDraw
+
+    left, top, right, bottom = font.getbbox(text)
+    image = Image.new("L", (right + RENDER_SIZE, bottom + RENDER_SIZE), 0)
+    ImageDraw.Draw(image).text((RENDER_SIZE // 2, RENDER_SIZE // 2), text, fill=255, font=font)
+    return normalize_line(np.asarray(image))
+
+
+class MapClassifier:
+    """Matches the map ROI against one template per spelling of every known map"""
+
+    def __init__(self, map_names, font_path, min_similarity=0.6):
+        from PIL import ImageFont
+
+        font = ImageFont.truetype(font_path, RENDER_SIZE)
+        self.map_names = list(map_names)
+        self.min_similarity = min_similarity
+        # (map name, normalized text line)
+        self.templates = []
+        for name in self.map_names:
+            for spelling in MAP_DISPLAY_NAMES.get(name, [name]):
+                for text in (spelling, spelling.upper()):
+                    self.templates.append((name, render_line(text, font)))
+        self.learned = {}
+        self.matched = 0
+        self.fallbacks = 0
+
+    def similarities(self, line):
+        """Returns {map name: best similarity} of a normalized text line against all templates"""
+        scores = {}
+        for name, template in self.templates:
+            if abs(line.shape[1] / template.shape[1] - 1) > MAX_WIDTH_DIFFERENCE:
+                continue
+            scaled = cv.resize(line, (template.shape[1], LINE_HEIGHT), interpolation=cv.INTER_AREA)
+            scores[name] = max(scores.get(name, -1.0), correlation(scaled, template))
+        return scores
+
+    def classify(self, gray):
+        """
+        Classifies a grayscale map ROI
+        Returns (map name, similarity), or None if no known map matches well enough
+        """
+        line = normalize_line(gray)
+        scores = self.similarities(line) if line is not None else {}
+        if scores:
+            name = max(scores, key=scores.get)
+            if scores[name] >= self.min_similarity:
+                self.matched += 1
+                return name, scores[name]
+
+        self.fallbacks += 1
+        return None
+
+    def learn(self, name, gray):
+        """
+        Adds the map ROI of a screenshot as template, e.g. after OCR resolved the map
+        ROIs that resemble another map's templates more than the named map's are rejected.
+        Returns True if the template was added
+        """
+        if name not in self.map_names or self.learned.get(name, 0) >= MAX_LEARNED_TEMPLATES:
+            return False
+        line = normalize_line(gray)
+        if line is None:
+            return False
+        scores = self.similarities(line)
+        if any(score >= scores.get(name, -1.0) for other, score in scores.items() if other != name):
+            return False
+        self.templates.append((name, line))
+        self.learned[name] = self.learned.get(name, 0) + 1
+        return True
+
+    def reset_stats(self):
+        self.matched = 0
+        self.fallbacks = 0
+
+    def stats(self):
+        """Returns a short summary of how many map ROIs were classified without OCR"""
+        return f"Map classifier: {self.matched} matched, {self.fallbacks} fell back to OCR"
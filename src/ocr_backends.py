@@ -0,0 +1,190 @@
+"""
+Inference backends for the text recognizer.
+
+All backends are EasyOCR readers, so the engine keeps calling reader.recognize and
+reader.readtext. They differ in what runs the recognition network:
+
+    torch       EasyOCR as is: CUDA or MPS if available, otherwise the CPU with
+                EasyOCR's dynamic int8 quantization of the recognizer
+    torch-fp32  the same without quantization, as a baseline
+    onnx        the recognizer exported to ONNX and run by ONNX Runtime on the CPU
+    onnx-int8   the ONNX model with ONNX Runtime's dynamic int8 quantization
+    auto        torch on a GPU, else onnx if onnxruntime is installed, else torch
+
+The exported ONNX models are stored next to the EasyOCR models, so the export only
+happens on the first start.
+
+The text detector is only needed by reader.readtext, the engine's batched recognition works
+without it. Readers load it on their first detection, from a pickled copy of the loaded
+detector that is memory-mapped instead of being rebuilt and filled from its weights.
+"""
+import os
+import functools
+
+BACKENDS = ("auto", "torch", "torch-fp32", "onnx", "onnx-int8")
+
+# EasyOCR's default text detector
+DETECT_NETWORK = "craft"
+
+
+def detect_device():
+    """Returns 'cuda', 'mps' or 'cpu', whichever torch can use"""
+    import torch
+
+    if torch.cuda.is_available():
+        return "cuda"
+    if getattr(torch.backends, "mps", None) is not None and torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def onnxruntime_available():
+    try:
+        import onnxruntime  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def resolve_backend(backend="auto", gpu=True):
+    """Turns 'auto' into the backend to use on this machine"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown OCR backend '{backend}', expected one of {', '.join(BACKENDS)}")
+    if backend != "auto":
+        return backend
+    if gpu and detect_device() != "cpu":
+        return "torch"
+    return "onnx" if onnxruntime_available() else "torch"
+
+
+def create_reader(gpu=True, backend="auto"):
+    """Creates an EasyOCR reader whose recognizer runs on the given backend"""
+    reader_class = lazy_detector_reader()
+
+    backend = resolve_backend(backend, gpu)
+    if backend == "torch":
+        reader = reader_class(['en'], gpu=gpu, detector=False)
+    elif backend == "torch-fp32":
+        reader = reader_class(['en'], gpu=gpu, quantize=False, detector=False)
+    else:
+        # ONNX Runtime replaces the recognizer, exporting needs the unquantized CPU model
+        reader = reader_class(['en'], gpu=False, quantize=False, detector=False)
+        path = export_recognizer(reader, quantize=backend == "onnx-int8")
+        reader.recognizer = OnnxRecognizer(path)
+
+    # The backends read slightly differently, the OCR cache keeps their results apart
+    reader.backend = backend
+    return reader
+
+
+@functools.lru_cache(maxsize=None)
+def lazy_detector_reader():
+    """EasyOCR's Reader class with a text detector that is loaded on first use"""
+    import easyocr
+
+    class LazyDetectorReader(easyocr.Reader):
+        def detect(self, *args, **kwargs):
+            if getattr(self, "detector", None) is None:
+                load_detector(self)
+            return super().detect(*args, **kwargs)
+
+    return LazyDetectorReader
+
+
+def load_detector(reader):
+    """Loads the text detector of a reader created with detector=False"""
+    import easyocr
+    import torch
+
+    # Checks the model file and selects the detector's box extraction
+    detector_path = reader.getDetectorPath(DETECT_NETWORK)
+    if reader.device != "cpu":
+        reader.detector = reader.initDetector(detector_path)
+        return
+
+    path = os.path.join(reader.model_storage_directory,
+                        f"detector_{DETECT_NETWORK}_{easyocr.__version__}_torch{torch.__version__}.pt")
+    if os.path.exists(path):
+        try:
+            reader.detector = torch.load(path, mmap=True, weights_only=False)
+            return
+        except Exception:
+            # Unreadable cache, rebuilt below
+            pass
+
+    reader.detector = reader.initDetector(detector_path)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    torch.save(reader.detector, temp_path)
+    os.replace(temp_path, path)
+
+
+def export_recognizer(reader, quantize=False):
+    """Exports the reader's recognizer to ONNX once, returns the path of the model file"""
+    import easyocr
+
+    name = f"recognizer_{reader.model_lang}_{easyocr.__version__}"
+    path = os.path.join(reader.model_storage_directory, name + ".onnx")
+    quantized_path = os.path.join(reader.model_storage_directory, name + ".int8.onnx")
+
+    if not os.path.exists(path):
+        import torch
+
+        class ExportableRecognizer(torch.nn.Module):
+            """
+            The recognizer's forward pass with the image as the only input (the text input is
+            unused) and its AdaptiveAvgPool2d((None, 1)) written as the mean over the last axis,
+            which ONNX can export for a variable image width
+            """
+
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, image):
+                visual_feature = self.model.FeatureExtraction(image)
+                visual_feature = visual_feature.permute(0, 3, 1, 2).mean(dim=3)
+                contextual_feature = self.model.SequenceModeling(visual_feature)
+                return self.model.Prediction(contextual_feature.contiguous())
+
+        model = ExportableRecognizer(reader.recognizer).eval()
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        torch.onnx.export(model, torch.zeros(1, 1, 64, 256), temp_path, input_names=["image"],
+                          output_names=["prediction"], opset_version=17, dynamo=False,
+                          dynamic_axes={"image": {0: "batch", 3: "width"}, "prediction": {0: "batch", 1: "steps"}})
+        os.replace(temp_path, path)
+
+    if not quantize:
+        return path
+
+    if not os.path.exists(quantized_path):
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        temp_path = f"{quantized_path}.{os.getpid()}.tmp"
+        # Only the LSTM and linear layers, ONNX Runtime's integer convolutions are slower than fp32 on the CPU
+        quantize_dynamic(path, temp_path, weight_type=QuantType.QInt8, op_types_to_quantize=["LSTM", "MatMul", "Gemm"])
+        os.replace(temp_path, quantized_path)
+    return quantized_path
+
+
+class OnnxRecognizer:
+    """Stands in for EasyOCR's recognizer module and runs the exported model with ONNX Runtime"""
+
+    def __init__(self, path):
+        import onnxruntime
+        import torch
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Same thread budget as torch, which the worker processes limit
+        options.intra_op_num_threads = torch.get_num_threads()
+        self.session = onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.path = path
+
+    def eval(self):
+        return self
+
+    def __call__(self, image, text=None):
+        import torch
+
+        prediction = self.session.run(None, {"image": image.cpu().numpy()})[0]
+        return torch.from_numpy(prediction)
@@ -0,0 +1,94 @@
+import json
+import time
+import sqlite3
+import cv2 as cv
+import numpy as np
+
+# Size of the difference hash, HASH_WIDTH x HASH_HEIGHT bits
+HASH_WIDTH = 32
+HASH_HEIGHT = 8
+
+# Regions whose content repeats across raids, numbers and names are never worth caching
+CACHEABLE_REGIONS = {"Next", "Status", "map", "KillList/Faction"}
+
+
+def roi_cache_name(key):
+    """Returns the cache name of a region key, kill list cells are keyed by (row, column)"""
+    if isinstance(key, tuple):
+        return f"KillList/{key[1]}"
+    return key
+
+
+def perceptual_hash(roi):
+    """
+    Difference hash of a BGR or grayscale region
+    Small pixel noise keeps the hash stable, while different words change it
+    """
+    gray = cv.cvtColor(roi, cv.COLOR_BGR2GRAY) if roi.ndim == 3 else roi
+    small = cv.resize(gray, (HASH_WIDTH + 1, HASH_HEIGHT), interpolation=cv.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return np.packbits(bits).tobytes().hex()
+
+
+class OCRResultCache:
+    """
+    On-disk cache of OCR results keyed by region name and perceptual hash of the crop, and by
+    the variant of the OCR (backend and preprocessing) that read it.
+    The least recently used entries are evicted once max_entries is exceeded.
+    """
+
+    def __init__(self, path, max_entries=5000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.connection = None
+
+    def connect(self):
+        """Opens the database lazily, so the connection belongs to the thread that uses it"""
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, timeout=10)
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_results ("
+                "key TEXT PRIMARY KEY, text TEXT NOT NULL, confidence REAL NOT NULL, last_used REAL NOT NULL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS ocr_results_lru ON ocr_results (last_used)")
+        return self.connection
+
+    def get(self, name, roi, variant="", min_confidence=0.0):
+        """Returns the cached (text_list, confidence) for the region, None if missing or below min_confidence"""
+        connection = self.connect()
+        key = f"{variant}:{name}:{perceptual_hash(roi)}"
+        row = connection.execute("SELECT text, confidence FROM ocr_results WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < min_confidence:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        with connection:
+            connection.execute("UPDATE ocr_results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0]), row[1]
+
+    def put(self, name, roi, text_list, confidence, variant=""):
+        """Stores the OCR result of a region and evicts the least recently used entries"""
+        connection = self.connect()
+        key = f"{variant}:{name}:{perceptual_hash(roi)}"
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO ocr_results VALUES (?, ?, ?, ?)",
+                               (key, json.dumps(text_list), float(confidence), time.time()))
+            connection.execute(
+                "DELETE FROM ocr_results WHERE key IN ("
+                "SELECT key FROM ocr_results ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,))
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Returns a short summary of the hit and miss counters"""
+        return f"OCR cache: {self.hits} hits, {self.misses} misses"
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
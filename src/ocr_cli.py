@@ -0,0 +1,210 @@
+"""
+Headless batch OCR without Qt.
+
+OCRs every complete raid folder in the input folder with the same engine as the OCR window,
+saves raid_data.json to the output folder and moves the screenshots to the archive folder.
+One JSON line is written per raid, so backfills can be scripted and timed:
+
+    {"raid": str, "status": "ok", "output": str, "seconds": {"load": float, "ocr": float,
+     "save": float, "total": float}}
+    {"raid": str, "status": "error", "error": str, "seconds": {...}}
+    {"raid": str, "status": "skipped", "error": str}
+
+With --jobs 1 loading and OCR are timed separately. With more jobs the folders are spread
+over worker processes which load and OCR in one step, so "ocr" includes the loading.
+Log messages go to stderr. The exit code is 1 if any raid failed.
+
+Usage:
+    python -m src.ocr_cli [--input DIR] [--output DIR] [--archive DIR] [--jobs N]
+                          [--cpu] [--backend NAME] [--no-cache] [--jsonl FILE] [--quiet]
+or "OCR.exe --batch ..." with the same arguments.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+from src.ocr_engine import RaidOCREngine, create_reader, save_and_archive, list_raid_folders
+from src.ocr_backends import BACKENDS
+from src.ocr_cache import OCRResultCache
+from src.ocr_journal import RaidJournal
+from src.ocr_pool import OCRProcessPool
+
+
+def missing_screenshots(subfolder):
+    """Returns why a raid folder can't be processed, None if it holds its 4 screenshots"""
+    png_files = [f for f in os.listdir(subfolder) if f.endswith('.png')]
+    if len(png_files) != 4:
+        return f"Expected 4 PNG files, found {len(png_files)}"
+    return None
+
+
+class BatchOCR:
+    """Runs the OCR for all raid folders of one input folder and reports each raid as a JSON line"""
+
+    def __init__(self, input_dir, output_dir, archive_dir, jobs=1, gpu=True, backend="auto",
+                 use_cache=True, out=sys.stdout, log=None):
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.archive_dir = archive_dir
+        self.jobs = jobs
+        self.gpu = gpu
+        self.backend = backend
+        self.use_cache = use_cache
+        # Stream the JSON lines are written to
+        self.out = out
+        self.log = log or (lambda message: print(message, file=sys.stderr, flush=True))
+        self.failed = 0
+
+    def cache_path(self):
+        return os.path.join(self.output_dir, "ocr_cache.sqlite") if self.use_cache else None
+
+    def report(self, record):
+        if "seconds" in record:
+            record["seconds"] = {name: round(value, 4) for name, value in record["seconds"].items()}
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.out.flush()
+        if record["status"] == "error":
+            self.failed += 1
+
+    def run(self):
+        """Processes all raid folders, returns the number of raids saved"""
+        for directory in [self.input_dir, self.output_dir, self.archive_dir]:
+            os.makedirs(directory, exist_ok=True)
+
+        subfolders = []
+        for subfolder in list_raid_folders(self.input_dir):
+            problem = missing_screenshots(subfolder)
+            if problem is None:
+                subfolders.append(subfolder)
+            else:
+                self.report({"raid": os.path.basename(subfolder), "status": "skipped", "error": problem})
+
+        if not subfolders:
+            self.log(f"No complete raid folders found in '{self.input_dir}'")
+            return 0
+
+        start = time.perf_counter()
+        if self.jobs > 1 and len(subfolders) > 1:
+            saved = self.run_parallel(subfolders)
+        else:
+            saved = self.run_serial(subfolders)
+        self.log(f"Processed {saved} of {len(subfolders)} raids in {time.perf_counter() - start:.1f}s")
+        return saved
+
+    def run_serial(self, subfolders):
+        """Processes the folders one after another with one warm reader"""
+        engine = RaidOCREngine(log=self.log)
+        engine.reader = create_reader(self.gpu, self.backend)
+        engine.warm_up()
+        if self.use_cache:
+            engine.cache = OCRResultCache(self.cache_path())
+
+        saved = 0
+        try:
+            for subfolder in subfolders:
+                seconds = {}
+                start = time.perf_counter()
+                try:
+                    journal = RaidJournal(self.output_dir, subfolder)
+                    images = engine.load_images(subfolder, engine.pending_pages(journal))
+                    seconds["load"] = time.perf_counter() - start
+
+                    ocr_start = time.perf_counter()
+                    all_data = engine.process_images(images, journal)
+                    seconds["ocr"] = time.perf_counter() - ocr_start
+                    del images
+                except Exception as e:
+                    seconds["total"] = time.perf_counter() - start
+                    self.report({"raid": os.path.basename(subfolder), "status": "error", "error": str(e),
+                                 "seconds": seconds})
+                    continue
+
+                if self.save(subfolder, all_data, seconds, start):
+                    saved += 1
+        finally:
+            if engine.cache is not None:
+                engine.cache.close()
+
+        return saved
+
+    def run_parallel(self, subfolders):
+        """Spreads the folders over worker processes, the results are saved here"""
+        processes = min(self.jobs, len(subfolders))
+        pool = OCRProcessPool(processes, gpu=self.gpu, cache_path=self.cache_path(), data_dir=self.output_dir,
+                              backend=self.backend)
+        self.log(f"Starting {processes} OCR worker processes with {pool.threads_per_process} threads each...")
+
+        saved = 0
+        for subfolder, all_data, messages, error, ocr_seconds in pool.map_folders(subfolders):
+            for message in messages:
+                self.log(message)
+
+            seconds = {"ocr": ocr_seconds}
+            if error is not None:
+                seconds["total"] = ocr_seconds
+                self.report({"raid": os.path.basename(subfolder), "status": "error", "error": error,
+                             "seconds": seconds})
+                continue
+
+            # The worker's time is counted as part of the total
+            if self.save(subfolder, all_data, seconds, time.perf_counter() - ocr_seconds):
+                saved += 1
+
+        return saved
+
+    def save(self, subfolder, all_data, seconds, start):
+        """Saves and archives one raid and reports it, returns True if it was saved"""
+        raid = os.path.basename(subfolder)
+        save_start = time.perf_counter()
+        try:
+            save_and_archive(subfolder, all_data, self.output_dir, self.archive_dir, self.log)
+        except Exception as e:
+            seconds["total"] = time.perf_counter() - start
+            self.report({"raid": raid, "status": "error", "error": str(e), "seconds": seconds})
+            return False
+
+        seconds["save"] = time.perf_counter() - save_start
+        seconds["total"] = time.perf_counter() - start
+        self.report({"raid": raid, "status": "ok", "output": os.path.join(self.output_dir, raid, "raid_data.json"),
+                     "seconds": seconds})
+        return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", default="Raids new", help="folder with one subfolder of screenshots per raid")
+    parser.add_argument("--output", default="data", help="folder raid_data.json is written to")
+    parser.add_argument("--archive", default="Raids old", help="folder the processed raid folders are moved to")
+    parser.add_argument("--jobs", type=int, default=1, help="number of OCR worker processes")
+    parser.add_argument("--cpu", action="store_true", help="don't use the GPU")
+    parser.add_argument("--backend", default="auto", choices=BACKENDS, help="recognizer backend")
+    parser.add_argument("--no-cache", action="store_true", help="don't use the OCR result cache")
+    parser.add_argument("--jsonl", help="write the JSON lines to this file instead of stdout")
+    parser.add_argument("--quiet", action="store_true", help="don't log progress to stderr")
+    args = parser.parse_args(argv)
+
+    if args.jsonl:
+        out = open(args.jsonl, 'a', encoding='utf-8')
+    else:
+        # Keep stdout for the JSON lines, prints of the asset manager, the libraries and the
+        # worker processes go to stderr
+        sys.stdout.flush()
+        out = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    # Stays None if BatchOCR can't be created, its exception is raised after closing the output
+    batch = None
+    try:
+        batch = BatchOCR(args.input, args.output, args.archive, max(1, args.jobs), not args.cpu, args.backend,
+                         not args.no_cache, out, log=(lambda message: None) if args.quiet else None)
+        batch.run()
+    finally:
+        out.close()
+
+    return 1 if batch is None or batch.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
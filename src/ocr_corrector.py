@@ -1,15 +1,33 @@
 import re
 import json
+import functools
+from types import MappingProxyType
 from datetime import datetime
 
+from src.fuzzy_matcher import MAP_MATCHER, FACTION_MATCHER, STATUS_MATCHER
+
+# 'O' or 'o' between digits, read for a zero
+O_BETWEEN_DIGITS = re.compile(r'(?<=\d)[Oo](?=\d)')
+DIGIT_RUNS = re.compile(r'\d+')
+DIGIT = re.compile(r'\d')
+
+# Readings remembered per field by the shared corrector
+FIELD_CACHE_SIZE = 4096
+
 
 class OCRDataCorrector:
     """
     Class to handle OCR data corrections for the EFT Tracker application.
     Fixes common OCR recognition errors in map names, numerical values, and more.
+
+    Map names, factions and statuses are matched against their vocabularies by the fuzzy
+    matchers of src/fuzzy_matcher.py. The correction dictionaries below are only a fast
+    path for known misreadings and can be turned off with use_corrections=False.
     """
 
-    def __init__(self):
+    def __init__(self, use_corrections=True):
+        self.use_corrections = use_corrections
+
         # Maps known incorrect OCR readings to their correct values
         self.map_corrections = {
             # Common map name errors
@@ -83,19 +101,43 @@ class OCRDataCorrector:
             "Missinq in Action": "Missing in Action"
         }
 
+        # Case-insensitive lookup of the map corrections
+        self.map_corrections_lower = {incorrect.lower(): correct for incorrect, correct in self.map_corrections.items()}
+
+    def match_vocabulary(self, text, corrections, matcher):
+        """
+        Returns (canonical value, edit distance) for text, from the corrections if they know
+        the reading, otherwise from the fuzzy matcher; (None, None) if nothing is close enough
+        Known readings count as exact, their distance is 0
+        """
+        if self.use_corrections:
+            correct = corrections.get(text)
+            if correct is not None:
+                return correct, 0
+        return matcher.match(text)
+
+    def match_map_name(self, map_name):
+        """Returns (map name, edit distance) of the closest known map, or (None, None)"""
+        # The map corrections are looked up case-insensitively
+        return self.match_vocabulary(map_name.lower(), self.map_corrections_lower, MAP_MATCHER)
+
+    def match_faction(self, faction_text):
+        """Returns (faction, edit distance) of the closest known faction, or (None, None)"""
+        return self.match_vocabulary(faction_text, self.faction_corrections, FACTION_MATCHER)
+
+    def match_status(self, status_text):
+        """Returns (status, edit distance) of the closest known raid status, or (None, None)"""
+        return self.match_vocabulary(status_text, self.status_corrections, STATUS_MATCHER)
+
     def correct_map_name(self, map_name):
         """Fixes common OCR errors in map names"""
         if not map_name or map_name == "Unknown":
             return "Unknown"
 
-        # Check direct mapping first
-        if map_name in self.map_corrections:
-            return self.map_corrections[map_name]
-
-        # Try case-insensitive mapping
-        for incorrect, correct in self.map_corrections.items():
-            if map_name.lower() == incorrect.lower():
-                return correct
+        # Known misreadings first, then the closest map name
+        correct, distance = self.match_map_name(map_name)
+        if correct is not None:
+            return correct
 
         # Handle special cases like "Streets of Tarkov" -> "Streets"
         if "street" in map_name.lower():
@@ -120,16 +162,17 @@ class OCRDataCorrector:
 
         # NEW: Replace 'O' or 'o' between numbers with '0'
         # Use regex to find 'O' or 'o' between digits
-        corrected_text = re.sub(r'(?<=\d)[Oo](?=\d)', '0', status_text)
+        corrected_text = O_BETWEEN_DIGITS.sub('0', status_text)
 
         # IMPORTANT: If the string already starts with "Killed", preserve it completely
         # This preserves weapon and distance information in kill lists
         if corrected_text.startswith("Killed"):
             return corrected_text
 
-        # Check direct mapping for corrections
-        if corrected_text in self.status_corrections:
-            return self.status_corrections[corrected_text]
+        # Known misreadings first, then the closest status
+        correct, distance = self.match_status(corrected_text)
+        if correct is not None:
+            return correct
 
         # Look for keywords for other status types
         if "surv" in corrected_text.lower():
@@ -153,9 +196,10 @@ class OCRDataCorrector:
         if not faction_text or faction_text == "Unknown":
             return "Unknown"
 
-        # Check direct mapping
-        if faction_text in self.faction_corrections:
-            return self.faction_corrections[faction_text]
+        # Known misreadings first, then the closest faction
+        correct, distance = self.match_faction(faction_text)
+        if correct is not None:
+            return correct
 
         # Case insensitive checks
         faction_text_lower = faction_text.lower()
@@ -193,7 +237,7 @@ class OCRDataCorrector:
         # Extract only digits from the text
         try:
             # Find numbers in the text
-            digits = re.findall(r'\d+', corrected_text)
+            digits = DIGIT_RUNS.findall(corrected_text)
             if digits:
                 # Join all found digits and convert to int
                 return int(''.join(digits))
@@ -217,7 +261,7 @@ class OCRDataCorrector:
         corrected_text = time_text.replace('@', '0').replace('g', '9')
 
         # Extract only digits from the text
-        digits = re.findall(r'\d', corrected_text)
+        digits = DIGIT.findall(corrected_text)
 
         # If we have at least 2 digits, format properly
         if len(digits) >= 2:
@@ -323,23 +367,50 @@ class OCRDataCorrector:
         return corrected_raid
 
 
+class SharedCorrector(OCRDataCorrector):
+    """
+    Corrector shared by all callers, see shared_corrector()
+    The correction dictionaries are read-only and every field correction is memoized, the
+    same readings come up in raid after raid.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.map_corrections = MappingProxyType(self.map_corrections)
+        self.map_corrections_lower = MappingProxyType(self.map_corrections_lower)
+        self.faction_corrections = MappingProxyType(self.faction_corrections)
+        self.status_corrections = MappingProxyType(self.status_corrections)
+
+        for name in ["correct_map_name", "correct_status", "correct_faction", "correct_number",
+                     "correct_time_format"]:
+            setattr(self, name, functools.lru_cache(maxsize=FIELD_CACHE_SIZE)(getattr(super(), name)))
+
+    def cache_info(self):
+        """lru_cache statistics per field correction"""
+        return {name: getattr(self, name).cache_info() for name in
+                ["correct_map_name", "correct_status", "correct_faction", "correct_number", "correct_time_format"]}
+
+
+@functools.lru_cache(maxsize=None)
+def shared_corrector():
+    """The SharedCorrector instance, created on first use"""
+    return SharedCorrector()
+
+
+def correct_raids(raids):
+    """Corrects raid data dictionaries like correct_raid_data, returns the corrected raids as a list"""
+    corrector = shared_corrector()
+    return [corrector.correct_raid_data(raid) for raid in raids]
+
+
 # Example of how to integrate with the EFT Tracker app
 def integrate_ocr_correction(eft_tracker_app):
     """
     Shows how to integrate OCR correction into the EFT Tracker app
     Replace the load_raids method or add to process_ocr_data
     """
-    # Create the corrector instance
-    corrector = OCRDataCorrector()
-
-    # Original load_raids method
-    original_raids = eft_tracker_app.raids.copy()
-
-    # Apply corrections to each raid
-    corrected_raids = []
-    for raid in original_raids:
-        corrected_raid = corrector.correct_raid_data(raid)
-        corrected_raids.append(corrected_raid)
+    # Apply corrections to all raids with the shared corrector
+    corrected_raids = correct_raids(eft_tracker_app.raids)
 
     # Update the app's raids with corrected data
     eft_tracker_app.raids = corrected_raids
@@ -364,8 +435,7 @@ def correct_raid_json_file(json_file_path, output_path=None):
         with open(json_file_path, 'r', encoding='utf-8') as f:
             ocr_data = json.load(f)
 
-        # Create corrector
-        corrector = OCRDataCorrector()
+        corrector = shared_corrector()
 
         # Apply corrections to the OCR data structure
         # This would need to be adapted to match your specific JSON structure
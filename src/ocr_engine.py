@@ -0,0 +1,488 @@
+import os
+import json
+import shutil
+import cv2 as cv
+import numpy as np
+
+from src.ocr_regions import (STATUS_REGIONS, KILL_LIST_ROW_COUNT, RAID_STATISTICS_REGIONS, EXPERIENCE_REGIONS,
+                             kill_list_row_regions, page_regions, stack_crops)
+from src.ocr_cache import CACHEABLE_REGIONS, roi_cache_name
+from src.roi_image_loader import load_raid_images
+from src.archive_compactor import is_pack, load_pack_images
+from src.roi_preprocessing import preprocess_crops, region_type
+from src.digit_recognizer import DigitTemplateRecognizer
+from src.map_classifier import MapClassifier, known_maps
+from src.kill_list_layout import detect_kill_list_cells
+from src.ocr_corrector import shared_corrector
+from src.ocr_journal import discard_journal
+
+
+# A pixel counts as an edge if it differs this much from its right neighbour
+BLANK_EDGE_MAGNITUDE = 40
+# Regions with a lower share of edge pixels don't contain any text
+BLANK_EDGE_DENSITY = 0.002
+
+# Regions recognized with a lower confidence are read again with the expensive settings below
+ESCALATION_CONFIDENCE = 0.5
+# Preprocessing profile and decoder of the second pass, see roi_preprocessing.PREPROCESSING_PROFILES
+ESCALATION_PROFILE = "binary_x2"
+ESCALATION_DECODER = "beamsearch"
+# At most this many regions per screenshot get the second pass, the least confident first,
+# EasyOCR's beam search takes a few hundred milliseconds per region
+ESCALATION_LIMIT = 10
+
+# The map classifier only learns a screenshot's map ROI from OCR text read with at least this confidence
+MAP_LEARN_CONFIDENCE = 0.9
+
+
+def to_gray(roi):
+    """Converts a BGR region to grayscale, grayscale regions are returned as they are"""
+    return roi if roi.ndim == 2 else cv.cvtColor(roi, cv.COLOR_BGR2GRAY)
+
+
+def edge_density(roi):
+    """Returns the share of pixels in a region with a strong horizontal gradient"""
+    gray = to_gray(roi).astype(np.int16)
+    gradient = np.abs(np.diff(gray, axis=1))
+    return np.count_nonzero(gradient > BLANK_EDGE_MAGNITUDE) / gradient.size
+
+
+def is_blank(roi):
+    """Checks whether a region contains no text"""
+    return edge_density(roi) < BLANK_EDGE_DENSITY
+
+
+def create_reader(gpu=True, backend="auto"):
+    """Creates the EasyOCR reader used for all screenshots, see ocr_backends.BACKENDS"""
+    from src.ocr_backends import create_reader as create_backend_reader
+    return create_backend_reader(gpu, backend)
+
+
+def save_to_json(data_dict, filename):
+    """Save dictionary to JSON file"""
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(data_dict, f, ensure_ascii=False, indent=4)
+
+
+def save_and_archive(subfolder, all_data, data_dir, archive_folder, log=print):
+    """Saves the OCR results of a raid and moves its screenshots to the archive"""
+    folder_name = os.path.basename(subfolder)
+    data_path = os.path.join(data_dir, folder_name)
+
+    if not os.path.exists(data_path):
+        os.makedirs(data_path)
+
+    # Save data to JSON
+    json_file = os.path.join(data_path, "raid_data.json")
+    save_to_json(all_data, json_file)
+    log(f"All data saved to: {json_file}")
+    discard_journal(data_dir, subfolder)
+
+    # Move processed folder to archive
+    try:
+        target_folder = os.path.join(archive_folder, folder_name)
+        shutil.move(subfolder, target_folder)
+        log(f"Folder moved to: {target_folder}")
+    except Exception as e:
+        log(f"Error moving folder {subfolder}: {e}")
+
+
+def list_raid_folders(root_folder):
+    """Returns the raid folders below root_folder sorted by creation time"""
+    return sorted(
+        [f.path for f in os.scandir(root_folder) if f.is_dir()],
+        key=lambda x: os.path.getctime(x)
+    )
+
+# Section of raid_data.json filled from each screenshot, in page order
+PAGE_SECTIONS = ("Status", "KillList", "RaidStatistics", "ExperienceGained")
+
+
+class RaidOCREngine:
+    """
+    OCR of the four end-of-raid screenshots without any Qt dependency.
+    Used by the OCRWorker thread as well as by the OCR worker processes.
+    """
+
+    def __init__(self, reader=None, log=print, cache=None):
+        self.reader = reader
+        self.log = log
+        # Optional OCRResultCache for regions that repeat across raids
+        self.cache = cache
+        # Recognize the fixed regions directly instead of running text detection on each of them
+        self.batch_recognition = True
+        # Don't OCR blank kill list cells and rows below the first blank row
+        self.skip_blank_rows = True
+        # Find the filled kill list cells by projection profiles and crop them to their text,
+        # the fixed grid is used if the page doesn't fit the layout
+        self.detect_kill_rows = True
+        # Decode only the grayscale ROI stripes of the screenshots instead of the full images
+        self.roi_only_decode = True
+        # Resolution divisor per screenshot for the ROI-only decode
+        self.decode_scales = (1, 1, 1, 1)
+        # Preprocessing profile per ROI type, see roi_preprocessing.PREPROCESSING_PROFILES
+        self.preprocessing = {"digits": "none", "text": "none"}
+        # Read digit-only regions by template matching against the game font first,
+        # only regions the templates don't match confidently go to the recognizer
+        self.digit_templates = True
+        self.digit_recognizer = None
+        # Classify the map ROI against the known maps, OCR only maps the classifier doesn't know
+        self.classify_maps = True
+        self.map_classifier = None
+        # Read regions recognized with a confidence below escalation_confidence again, upscaled,
+        # binarized and with beam search decoding, and keep the more confident reading
+        self.escalate_low_confidence = True
+        self.escalation_confidence = ESCALATION_CONFIDENCE
+        # Low-confidence regions of the current raid read again and how many of them the second pass improved
+        self.escalated = 0
+        self.escalation_improved = 0
+        # Confidence of every field of the raid being processed, per section
+        self.confidences = {}
+
+    def warm_up(self):
+        """Runs one small inference so the first real screenshot doesn't pay for lazy initialization"""
+        blank = np.zeros((32, 128, 3), dtype=np.uint8)
+        self.read_regions(blank, {"warm_up": (0, 32, 0, 128)})
+
+    def load_images(self, subfolder, pages=None):
+        """
+        Loads the screenshots of a raid folder in page order
+        Only the given pages are loaded if pages is set, the others are None
+        """
+        # Raids packed by the archive compactor only hold the ROI stripes
+        if is_pack(subfolder):
+            return load_pack_images(subfolder, self.decode_scales, pages)
+        if self.roi_only_decode:
+            return load_raid_images(subfolder, self.decode_scales, pages)
+
+        png_files = sorted(f for f in os.listdir(subfolder) if f.endswith('.png'))
+        return [cv.imread(os.path.join(subfolder, png)) if pages is None or page in pages else None
+                for page, png in enumerate(png_files)]
+
+    def process_folder(self, subfolder, journal=None):
+        """
+        Runs the OCR for a raid folder
+        With a RaidJournal, screenshots finished by an earlier run are neither loaded nor OCRed again
+        """
+        return self.process_images(self.load_images(subfolder, self.pending_pages(journal)), journal)
+
+    def pending_pages(self, journal):
+        """Pages the journal has no result for yet, None (all pages) without a journal"""
+        if journal is None:
+            return None
+        return [page for page, section in enumerate(PAGE_SECTIONS) if journal.completed(section) is None]
+
+    def process_images(self, images, journal=None):
+        """
+        Runs the OCR for all four screenshots of a raid
+        With a RaidJournal, each screenshot's result is recorded as soon as it is done
+        """
+        all_data = {}
+        self.confidences = {}
+        self.reset_stats()
+        for page, section in enumerate(PAGE_SECTIONS):
+            if journal is not None and journal.completed(section) is not None:
+                all_data[section] = journal.completed(section)
+                self.confidences[section] = journal.confidence(section)
+                self.log(f"{section}: resumed from journal")
+                continue
+
+            all_data[section] = getattr(self, f"process_image{page}")(images[page])
+            if journal is not None:
+                journal.record(section, all_data[section], self.confidences.get(section, {}))
+
+        # Confidence of every field in the layout of its section, for the correction of the results
+        all_data["Confidence"] = self.confidences
+
+        if self.cache is not None:
+            self.log(self.cache.stats())
+        if self.digit_recognizer is not None:
+            self.log(self.digit_recognizer.stats())
+        if self.map_classifier is not None:
+            self.log(self.map_classifier.stats())
+        if self.escalated:
+            self.log(f"Re-OCR: {self.escalation_improved} of {self.escalated} low-confidence regions improved")
+
+        return all_data
+
+    def reset_stats(self):
+        """Resets the counters logged after every raid, so they count the raid being processed"""
+        self.escalated = 0
+        self.escalation_improved = 0
+        for counter in (self.cache, self.digit_recognizer, self.map_classifier):
+            if counter is not None:
+                counter.reset_stats()
+
+    def read_regions(self, img, regions):
+        """
+        OCR a table of named regions on one screenshot, answering repeated regions from the cache
+        Returns a dictionary of region name -> list of recognized strings
+        """
+        detailed = self.read_regions_detailed(img, regions)
+        return {name: text_list for name, (text_list, confidence) in detailed.items()}
+
+    def read_regions_detailed(self, img, regions):
+        """
+        Same as read_regions, returns a dictionary of region name -> (list of recognized strings, confidence)
+        """
+        results = {}
+        pending = {}
+        for name, (y1, y2, x1, x2) in regions.items():
+            cache_name = roi_cache_name(name)
+            if self.cache is not None and cache_name in CACHEABLE_REGIONS:
+                cached = self.cache.get(cache_name, img[y1:y2, x1:x2], self.cache_variant(),
+                                        self.escalation_confidence)
+                if cached is not None:
+                    results[name] = cached
+                    continue
+            pending[name] = (y1, y2, x1, x2)
+
+        recognized = self.recognize_regions(img, pending)
+        if self.escalate_low_confidence:
+            recognized.update(self.escalate(img, pending, recognized))
+
+        for name, (text_list, confidence) in recognized.items():
+            results[name] = (text_list, confidence)
+            cache_name = roi_cache_name(name)
+            # Only confident readings are cached, a bad one would be copied into every later raid
+            if self.cache is not None and cache_name in CACHEABLE_REGIONS and confidence >= self.escalation_confidence:
+                y1, y2, x1, x2 = pending[name]
+                self.cache.put(cache_name, img[y1:y2, x1:x2], text_list, confidence, self.cache_variant())
+
+        # Keep the order of the region table
+        return {name: results[name] for name in regions}
+
+    def cache_variant(self):
+        """Backend and preprocessing of the readings, results of other variants are not reused"""
+        return f"{getattr(self.reader, 'backend', 'unknown')}/{self.preprocessing['text']}"
+
+    def escalate(self, img, regions, recognized):
+        """
+        Reads the regions recognized with a low confidence again with the expensive second pass
+        Returns the results of the regions the second pass read with a higher confidence
+        """
+        candidates = []
+        for name, (text_list, confidence) in recognized.items():
+            y1, y2, x1, x2 = regions[name]
+            if confidence < self.escalation_confidence and not is_blank(img[y1:y2, x1:x2]):
+                candidates.append((confidence, name))
+        if not candidates:
+            return {}
+
+        low = {name: regions[name] for confidence, name in sorted(candidates, key=lambda c: c[0])[:ESCALATION_LIMIT]}
+
+        crops = preprocess_crops([to_gray(img[y1:y2, x1:x2]) for (y1, y2, x1, x2) in low.values()],
+                                 ESCALATION_PROFILE)
+        second_pass = self.recognize_crops(list(low), crops, ESCALATION_DECODER)
+
+        improved = {name: result for name, result in second_pass.items() if result[1] > recognized[name][1]}
+        self.escalated += len(low)
+        self.escalation_improved += len(improved)
+        return improved
+
+    def recognize_regions(self, img, regions):
+        """
+        Runs the recognizer on a table of named regions
+        Returns a dictionary of region name -> (list of recognized strings, confidence)
+        """
+        if not regions:
+            return {}
+
+        # Without the detector nothing tells an empty crop apart, and the recognizer reads some
+        # text into every box it gets, so crops without text are answered here
+        results = {name: ([], 0.0) for name, (y1, y2, x1, x2) in regions.items() if is_blank(img[y1:y2, x1:x2])}
+        regions = {name: region for name, region in regions.items() if name not in results}
+        if not regions:
+            return results
+
+        if self.digit_templates:
+            results.update(self.read_digit_regions(img, regions))
+            regions = {name: region for name, region in regions.items() if name not in results}
+            if not regions:
+                return results
+
+        results.update(self.recognize_crops(list(regions), self.prepare_crops(img, regions)))
+        return results
+
+    def recognize_crops(self, names, crops, decoder="greedy"):
+        """
+        Runs the recognizer on preprocessed crops
+        Returns a dictionary of region name -> (list of recognized strings, confidence)
+        """
+        results = {}
+        if not self.batch_recognition:
+            for name, crop in zip(names, crops):
+                detections = self.reader.readtext(crop, detail=1, decoder=decoder)
+                confidence = min((detection[2] for detection in detections), default=0.0)
+                results[name] = ([detection[1] for detection in detections], float(confidence))
+            return results
+
+        # All boxes are known in advance, so the CRAFT detector can be skipped entirely:
+        # stack the crops onto one grayscale canvas and recognize all boxes in a single call
+        canvas, boxes, band_height = stack_crops(crops)
+        recognized = self.reader.recognize(canvas, horizontal_list=boxes, free_list=[],
+                                           batch_size=len(boxes), detail=1, decoder=decoder)
+
+        # The recognizer may reorder boxes, map them back to their region by canvas band
+        results.update({name: ([], 0.0) for name in names})
+        for box, text, confidence in recognized:
+            name = names[box[0][1] // band_height]
+            if text:
+                results[name] = ([text], float(confidence))
+
+        return results
+
+    def read_digit_regions(self, img, regions):
+        """
+        Reads the digit-only regions with the template recognizer
+        Returns a dictionary of region name -> (list of recognized strings, confidence) for the
+        regions the templates matched confidently
+        """
+        results = {}
+        for name, (y1, y2, x1, x2) in regions.items():
+            if region_type(roi_cache_name(name)) != "digits":
+                continue
+
+            if self.digit_recognizer is None:
+                from src.AssetManager import AssetManager
+                self.digit_recognizer = DigitTemplateRecognizer(AssetManager().get_font_path("bender.regular.otf"))
+
+            reading = self.digit_recognizer.read(to_gray(img[y1:y2, x1:x2]))
+            if reading is not None:
+                text, confidence = reading
+                results[name] = ([text] if text else [], confidence)
+
+        return results
+
+    def prepare_crops(self, img, regions):
+        """Cuts the regions out as grayscale crops and preprocesses them batched per ROI type"""
+        crops = [to_gray(img[y1:y2, x1:x2]) for (y1, y2, x1, x2) in regions.values()]
+
+        groups = {}
+        for i, name in enumerate(regions):
+            groups.setdefault(region_type(roi_cache_name(name)), []).append(i)
+
+        for roi_type, indices in groups.items():
+            processed = preprocess_crops([crops[i] for i in indices], self.preprocessing.get(roi_type, "none"))
+            for i, crop in zip(indices, processed):
+                crops[i] = crop
+
+        return crops
+
+    def process_image0(self, img0):
+        """Process Status Image OCR"""
+        detailed = self.read_regions_detailed(img0, STATUS_REGIONS)
+        self.confidences["Status"] = {name: confidence for name, (text, confidence) in detailed.items()}
+
+        results = {name: text for name, (text, confidence) in detailed.items()}
+        for name, text in results.items():
+            self.log(f"{name}: {text}")
+
+        return results
+
+    def process_image1(self, img1):
+        """Process Kill List OCR with detailed sub-regions"""
+        # Read all cells of the page at once, keyed by (row, column)
+        regions = None
+        # The detector works in full resolution coordinates
+        if self.detect_kill_rows and getattr(img1, "scale", 1) == 1:
+            regions = detect_kill_list_cells(img1)
+            if regions is None:
+                self.log("Kill list: layout not detected, using the fixed grid")
+            else:
+                self.log(f"Kill list: {len({row for row, name in regions})} rows detected, "
+                         f"{len(regions)} cells with text")
+
+        if regions is None:
+            regions = page_regions(1)
+            if self.skip_blank_rows:
+                regions = self.drop_blank_cells(img1, regions)
+        detailed = self.read_regions_detailed(img1, regions)
+
+        # Only cells that were read get a confidence, blank cells are left out
+        confidences = {}
+        for (i, name), (text_list, confidence) in detailed.items():
+            confidences.setdefault(f"row{i}", {})[name] = confidence
+        self.confidences["KillList"] = confidences
+
+        rows = {}
+        for i in range(1, KILL_LIST_ROW_COUNT + 1):
+            row_data = {}
+            for name in kill_list_row_regions(i):
+                text_list = detailed[(i, name)][0] if (i, name) in detailed else []
+
+                # Zusammenführen aller erkannten Strings zu einem einzigen String
+                if text_list:
+                    combined_text = " ".join(text_list)
+                    row_data[name] = combined_text
+                else:
+                    row_data[name] = ""
+
+            row_name = f"row{i}"
+            rows[row_name] = row_data
+
+            # Nur ausgeben, wenn tatsächlich ein Spieler erkannt wurde
+            if row_data["Player"]:
+                self.log(f"Kill {i}: {row_data['Player']} ({row_data['Faction']})")
+
+        return rows
+
+    def drop_blank_cells(self, img1, regions):
+        """
+        Removes kill list cells without text from the regions to OCR
+        Rows are filled from the top, so everything below the first blank row is dropped as well
+        """
+        blank = {key: is_blank(img1[y1:y2, x1:x2])
+                 for key, (y1, y2, x1, x2) in regions.items()}
+
+        # The row number column may be filled even for rows without a kill
+        first_blank_row = KILL_LIST_ROW_COUNT + 1
+        for i in range(1, KILL_LIST_ROW_COUNT + 1):
+            if all(blank[(i, name)] for name in kill_list_row_regions(i) if name != "No"):
+                first_blank_row = i
+                break
+
+        kept = {key: region for key, region in regions.items()
+                if key[0] < first_blank_row and not blank[key]}
+        self.log(f"Kill list: {first_blank_row - 1} rows with content, "
+                 f"skipped {len(regions) - len(kept)} of {len(regions)} OCR calls")
+        return kept
+
+    def process_image2(self, img2):
+        """Process Raid Statistics OCR"""
+        y1, y2, x1, x2 = RAID_STATISTICS_REGIONS["map"]
+        map_roi = to_gray(img2[y1:y2, x1:x2])
+
+        if self.classify_maps:
+            if self.map_classifier is None:
+                from src.AssetManager import AssetManager
+                assets = AssetManager()
+                self.map_classifier = MapClassifier(known_maps(assets.asset_dirs["maps"]),
+                                                    assets.get_font_path("bender.regular.otf"))
+
+            match = self.map_classifier.classify(map_roi)
+            if match is not None:
+                self.log(f"Map: {match[0]} (similarity {match[1]:.2f})")
+                self.confidences["RaidStatistics"] = {"map": match[1]}
+                return {"map": [match[0]]}
+
+        map_text, confidence = self.read_regions_detailed(img2, RAID_STATISTICS_REGIONS)["map"]
+        self.confidences["RaidStatistics"] = {"map": confidence}
+        self.log(f"Map: {map_text}")
+
+        # Remember how this screenshot renders the map, but only from a confident, exact reading,
+        # a wrong template would misclassify every later raid on the map
+        if self.classify_maps and map_text and confidence >= MAP_LEARN_CONFIDENCE:
+            map_name, distance = shared_corrector().match_map_name(" ".join(map_text))
+            if distance == 0 and self.map_classifier.learn(map_name, map_roi):
+                self.log(f"Map classifier learned a template for {map_name}")
+
+        return {"map": map_text}
+
+    def process_image3(self, img3):
+        """Process Experience Gained OCR"""
+        elimination_text, confidence = self.read_regions_detailed(img3, EXPERIENCE_REGIONS)["Eliminations"]
+        self.confidences["ExperienceGained"] = {"Eliminations": confidence}
+        self.log(f"Eliminations: {elimination_text}")
+
+        return {"Eliminations": elimination_text}
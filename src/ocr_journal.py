@@ -0,0 +1,80 @@
+"""
+Journal of the screenshots already OCRed for raid folders that are not finished yet.
+
+Each raid folder gets one JSON file in data/ocr_journal. The result of every screenshot is
+written to it as soon as that screenshot is done, by writing a temporary file and renaming
+it over the old one, so the journal is always complete even if the process is killed mid-write.
+When a run is restarted, the finished screenshots are taken from the journal instead of
+being OCRed again. The journal is removed once raid_data.json has been written.
+"""
+import os
+import json
+
+JOURNAL_FOLDER = "ocr_journal"
+
+
+def screenshot_fingerprint(subfolder):
+    """Names, sizes and modification times of the screenshots, to detect replaced files"""
+    fingerprint = []
+    for name in sorted(f for f in os.listdir(subfolder) if f.endswith('.png')):
+        stat = os.stat(os.path.join(subfolder, name))
+        fingerprint.append([name, stat.st_size, int(stat.st_mtime)])
+    return fingerprint
+
+
+def journal_path(data_dir, subfolder):
+    return os.path.join(data_dir, JOURNAL_FOLDER, os.path.basename(subfolder) + ".json")
+
+
+def discard_journal(data_dir, subfolder):
+    """Removes the journal of a raid folder once its results are saved"""
+    try:
+        os.remove(journal_path(data_dir, subfolder))
+    except FileNotFoundError:
+        pass
+
+
+class RaidJournal:
+    """Results of the finished screenshots of one raid folder"""
+
+    def __init__(self, data_dir, subfolder):
+        self.path = journal_path(data_dir, subfolder)
+        self.fingerprint = screenshot_fingerprint(subfolder)
+        # Confidences of the fields of each journaled section
+        self.confidences = {}
+        self.sections = self.load()
+
+    def load(self):
+        """Returns the journaled sections, nothing if the journal is missing, broken or outdated"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if journal.get("screenshots") != self.fingerprint:
+            return {}
+        self.confidences = journal.get("confidences", {})
+        return journal.get("sections", {})
+
+    def completed(self, section):
+        """Returns the journaled result of a section, or None if it wasn't finished yet"""
+        return self.sections.get(section)
+
+    def confidence(self, section):
+        """Returns the journaled field confidences of a section"""
+        return self.confidences.get(section, {})
+
+    def record(self, section, data, confidence=None):
+        """Adds the result of a finished section and writes the journal atomically"""
+        self.sections[section] = data
+        self.confidences[section] = confidence or {}
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"screenshots": self.fingerprint, "sections": self.sections, "confidences": self.confidences},
+                      f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
@@ -0,0 +1,160 @@
+"""
+Staged pipeline for OCRing many raid folders in one thread's engine.
+
+Three stages are connected by bounded queues:
+
+    loader thread -> load queue -> OCR (calling thread) -> write queue -> writer thread
+
+The loader decodes the screenshots of the next folders while the current one is OCRed, and
+the writer saves raid_data.json and moves the folder to the archive in the background, so
+disk work overlaps the inference. The OCR stage stays in the calling thread because the
+engine's reader and cache connection belong to it. Every stage counts its busy time and the
+queues are sampled on every hand-over, summary() shows which stage is the bottleneck.
+"""
+import time
+import queue
+import threading
+
+from src.ocr_engine import save_and_archive
+from src.ocr_journal import RaidJournal
+
+# Marks the end of the folder stream in a queue
+_DONE = object()
+
+
+class StageStats:
+    """Busy time and processed items of one stage, queue depth of its input queue"""
+
+    def __init__(self, name):
+        self.name = name
+        self.busy_seconds = 0.0
+        self.items = 0
+        self.queue_samples = 0
+        self.queue_depth_total = 0
+        self.queue_depth_max = 0
+
+    def sample_queue(self, depth):
+        self.queue_samples += 1
+        self.queue_depth_total += depth
+        self.queue_depth_max = max(self.queue_depth_max, depth)
+
+    def summary(self, wall_seconds):
+        busy_share = self.busy_seconds / wall_seconds if wall_seconds > 0 else 0.0
+        mean_depth = self.queue_depth_total / self.queue_samples if self.queue_samples else 0.0
+        return (f"{self.name}: {self.items} folders, busy {self.busy_seconds:.1f}s ({busy_share:.0%}), "
+                f"input queue mean {mean_depth:.1f} max {self.queue_depth_max}")
+
+
+class RaidPipeline:
+    """Loads, OCRs and saves raid folders in overlapping stages"""
+
+    def __init__(self, engine, data_dir, archive_folder, log=print, queue_size=2, should_stop=None):
+        self.engine = engine
+        self.data_dir = data_dir
+        self.archive_folder = archive_folder
+        self.log = log
+        # Stops feeding new folders once this returns True, folders already loaded are finished
+        self.should_stop = should_stop or (lambda: False)
+        self.load_queue = queue.Queue(queue_size)
+        self.write_queue = queue.Queue(queue_size)
+        self.stats = {name: StageStats(name) for name in ("load", "ocr", "write")}
+        self.wall_seconds = 0.0
+        self.saved = 0
+
+    def run(self, subfolders, progress=None):
+        """
+        Processes the given folders, progress(done, total) is called after each OCRed folder
+        Returns the number of folders saved
+        """
+        start = time.perf_counter()
+        loader = threading.Thread(target=self.load_stage, args=(subfolders,), name="OCR loader", daemon=True)
+        writer = threading.Thread(target=self.write_stage, name="OCR writer", daemon=True)
+        loader.start()
+        writer.start()
+        try:
+            self.ocr_stage(len(subfolders), progress)
+        finally:
+            self.write_queue.put(_DONE)
+            writer.join()
+            # Unblock the loader in case the OCR stage stopped early
+            while loader.is_alive():
+                try:
+                    self.load_queue.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            self.wall_seconds = time.perf_counter() - start
+
+        return self.saved
+
+    def load_stage(self, subfolders):
+        stats = self.stats["load"]
+        for subfolder in subfolders:
+            if self.should_stop():
+                break
+
+            busy_start = time.perf_counter()
+            try:
+                journal = RaidJournal(self.data_dir, subfolder)
+                images = self.engine.load_images(subfolder, self.engine.pending_pages(journal))
+                item = (subfolder, journal, images, None)
+            except Exception as e:
+                item = (subfolder, None, None, e)
+            stats.busy_seconds += time.perf_counter() - busy_start
+            stats.items += 1
+
+            self.load_queue.put(item)
+        self.load_queue.put(_DONE)
+
+    def ocr_stage(self, total, progress):
+        stats = self.stats["ocr"]
+        done = 0
+        while True:
+            stats.sample_queue(self.load_queue.qsize())
+            item = self.load_queue.get()
+            if item is _DONE:
+                return
+            subfolder, journal, images, error = item
+
+            busy_start = time.perf_counter()
+            if error is None:
+                self.log(f"Processing folder: {subfolder}")
+                try:
+                    all_data = self.engine.process_images(images, journal)
+                except Exception as e:
+                    error = e
+            stats.busy_seconds += time.perf_counter() - busy_start
+            stats.items += 1
+            del images
+
+            if error is not None:
+                self.log(f"Error processing folder {subfolder}: {error}")
+            else:
+                self.stats["write"].sample_queue(self.write_queue.qsize())
+                self.write_queue.put((subfolder, all_data))
+
+            done += 1
+            if progress is not None:
+                progress(done, total)
+
+    def write_stage(self):
+        stats = self.stats["write"]
+        while True:
+            item = self.write_queue.get()
+            if item is _DONE:
+                return
+            subfolder, all_data = item
+
+            busy_start = time.perf_counter()
+            try:
+                save_and_archive(subfolder, all_data, self.data_dir, self.archive_folder, self.log)
+                self.saved += 1
+            except Exception as e:
+                self.log(f"Error saving folder {subfolder}: {e}")
+            stats.busy_seconds += time.perf_counter() - busy_start
+            stats.items += 1
+
+    def summary(self):
+        """Per-stage busy time and queue depths of the last run"""
+        lines = [f"Pipeline: {self.wall_seconds:.1f}s wall time"]
+        lines += [stats.summary(self.wall_seconds) for stats in self.stats.values()]
+        return "\n".join(lines)
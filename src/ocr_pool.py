@@ -0,0 +1,100 @@
+import os
+import time
+import multiprocessing
+from contextlib import contextmanager
+
+from src.ocr_journal import RaidJournal
+
+# Thread limits of the math libraries, read by their runtimes when they are loaded
+THREAD_VARIABLES = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+# Engine of the current worker process, created once by _init_worker
+_engine = None
+# Data folder holding the OCR journals, None disables journaling
+_data_dir = None
+
+
+def _init_worker(threads, gpu, cache_path, data_dir, backend):
+    """Loads and warms up one reader per worker process with a bounded thread budget"""
+    global _engine, _data_dir
+    _data_dir = data_dir
+
+    # The thread variables are inherited from the parent (see thread_limits), so they are set
+    # before the spawned process imports anything. The OCR modules are imported only now
+    import cv2 as cv
+    import torch
+    from src.ocr_engine import RaidOCREngine, create_reader
+    from src.ocr_cache import OCRResultCache
+    cv.setNumThreads(threads)
+    torch.set_num_threads(threads)
+
+    cache = OCRResultCache(cache_path) if cache_path else None
+    _engine = RaidOCREngine(reader=create_reader(gpu, backend), cache=cache)
+    _engine.warm_up()
+
+
+def _process_folder(subfolder):
+    """Runs the OCR for one raid folder inside a worker process"""
+    messages = []
+    _engine.log = messages.append
+
+    start = time.perf_counter()
+    try:
+        journal = RaidJournal(_data_dir, subfolder) if _data_dir else None
+        all_data = _engine.process_folder(subfolder, journal)
+        error = None
+    except Exception as e:
+        all_data = None
+        error = str(e)
+
+    return subfolder, all_data, messages, error, time.perf_counter() - start
+
+
+@contextmanager
+def thread_limits(threads):
+    """Sets the thread variables for the processes spawned inside, and restores them afterwards"""
+    previous = {variable: os.environ.get(variable) for variable in THREAD_VARIABLES}
+    os.environ.update({variable: str(threads) for variable in THREAD_VARIABLES})
+    try:
+        yield
+    finally:
+        for variable, value in previous.items():
+            if value is None:
+                os.environ.pop(variable, None)
+            else:
+                os.environ[variable] = value
+
+
+class OCRProcessPool:
+    """
+    Spreads raid folders over several worker processes, each holding its own warm reader.
+    Results are yielded in completion order, saving and archiving is left to the caller.
+    """
+
+    def __init__(self, processes, threads_per_process=None, gpu=True, cache_path=None, data_dir=None,
+                 backend="auto"):
+        self.processes = processes
+        self.cache_path = cache_path
+        # Journal finished screenshots in data_dir so interrupted folders resume where they stopped
+        self.data_dir = data_dir
+        if threads_per_process is None:
+            threads_per_process = max(1, (os.cpu_count() or 1) // processes)
+        self.threads_per_process = threads_per_process
+        self.gpu = gpu
+        self.backend = backend
+
+    def map_folders(self, subfolders):
+        """
+        Processes the given folders in parallel
+        Yields (subfolder, all_data, messages, error, seconds) for each folder as soon as it is done
+        """
+        # Always spawn: forking a process with running Qt and torch threads is not safe
+        context = multiprocessing.get_context("spawn")
+        # The workers are spawned when the pool is created and inherit the environment then
+        with thread_limits(self.threads_per_process):
+            pool = context.Pool(self.processes, initializer=_init_worker,
+                                initargs=(self.threads_per_process, self.gpu, self.cache_path, self.data_dir,
+                                          self.backend))
+        with pool:
+            for result in pool.imap_unordered(_process_folder, subfolders):
+                yield result
@@ -0,0 +1,107 @@
+"""
+Regions of interest (ROI) on the four end-of-raid screenshots.
+
+All coordinates are given as (y1, y2, x1, x2) in pixels of a 2560x1440 screenshot,
+so a region can be cut out of an image with img[y1:y2, x1:x2].
+"""
+import numpy as np
+
+# Screenshot 1: raid status page
+STATUS_REGIONS = {
+    "Next": (1257, 1309, 1221, 1348),
+    "Status": (865, 900, 1080, 1313),
+    "Timer": (880, 910, 1387, 1537),
+    "Experience": (975, 1017, 1100, 1420),
+    "Names": (785, 823, 840, 1700),
+    "Level": (190, 270, 1026, 1145)
+}
+
+# Screenshot 2: kill list, 9 rows with 6 columns each
+KILL_LIST_ROW_COUNT = 9
+KILL_LIST_FIRST_ROW_Y = 334
+KILL_LIST_ROW_PITCH = 80
+KILL_LIST_ROW_HEIGHT = 65
+KILL_LIST_COLUMNS = {
+    "No": (648, 723),
+    "Time": (723, 880),
+    "Player": (880, 1260),
+    "LVL": (1260, 1334),
+    "Faction": (1334, 1487),
+    "Status": (1487, 1930)
+}
+# Area searched for the kill list rows by kill_list_layout, the grid plus a margin for shifted layouts
+KILL_LIST_SEARCH_MARGIN = 20
+KILL_LIST_AREA = (
+    KILL_LIST_FIRST_ROW_Y - KILL_LIST_SEARCH_MARGIN,
+    KILL_LIST_FIRST_ROW_Y + (KILL_LIST_ROW_COUNT - 1) * KILL_LIST_ROW_PITCH + KILL_LIST_ROW_HEIGHT + KILL_LIST_SEARCH_MARGIN,
+    min(x1 for x1, x2 in KILL_LIST_COLUMNS.values()) - KILL_LIST_SEARCH_MARGIN,
+    max(x2 for x1, x2 in KILL_LIST_COLUMNS.values()) + KILL_LIST_SEARCH_MARGIN
+)
+
+# Screenshot 3: raid statistics
+RAID_STATISTICS_REGIONS = {
+    "map": (142, 173, 1120, 1400)
+}
+
+# Screenshot 4: experience gained
+EXPERIENCE_REGIONS = {
+    "Eliminations": (484, 513, 882, 1062)
+}
+
+
+def kill_list_row_regions(row):
+    """Returns the column regions of kill list row 1-9"""
+    y_start = KILL_LIST_FIRST_ROW_Y + (row - 1) * KILL_LIST_ROW_PITCH
+    y_end = y_start + KILL_LIST_ROW_HEIGHT
+    return {name: (y_start, y_end, x1, x2) for name, (x1, x2) in KILL_LIST_COLUMNS.items()}
+
+
+def page_regions(page):
+    """Returns all regions of screenshot 0-3 as one table"""
+    if page == 0:
+        return dict(STATUS_REGIONS)
+    if page == 1:
+        regions = {}
+        for i in range(1, KILL_LIST_ROW_COUNT + 1):
+            for name, region in kill_list_row_regions(i).items():
+                regions[(i, name)] = region
+        return regions
+    if page == 2:
+        return dict(RAID_STATISTICS_REGIONS)
+    return dict(EXPERIENCE_REGIONS)
+
+
+def page_row_ranges(page, margin=0):
+    """Returns the merged (y1, y2) pixel row ranges covered by the regions of a screenshot"""
+    regions = list(page_regions(page).values())
+    if page == 1:
+        regions.append(KILL_LIST_AREA)
+    ranges = sorted((max(0, y1 - margin), y2 + margin) for (y1, y2, x1, x2) in regions)
+    merged = [list(ranges[0])]
+    for y1, y2 in ranges[1:]:
+        if y1 <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], y2)
+        else:
+            merged.append([y1, y2])
+    return [tuple(r) for r in merged]
+
+
+def stack_crops(crops):
+    """
+    Stacks single channel crops vertically onto one canvas.
+    Every crop gets its own band of equal height, so the band index of a box
+    can be recovered from its y coordinate.
+    Returns the canvas, the boxes as [x_min, x_max, y_min, y_max] and the band height.
+    """
+    band_height = max(crop.shape[0] for crop in crops)
+    width = max(crop.shape[1] for crop in crops)
+    canvas = np.zeros((band_height * len(crops), width), dtype=np.uint8)
+
+    boxes = []
+    for i, crop in enumerate(crops):
+        height, crop_width = crop.shape[:2]
+        y = i * band_height
+        canvas[y:y + height, :crop_width] = crop
+        boxes.append([0, crop_width, y, y + height])
+
+    return canvas, boxes, band_height
@@ -0,0 +1,240 @@
+"""
+Long-lived local OCR service.
+
+The service loads the OCR model once, warms it up and then accepts jobs from the
+EFT Tracker over a local socket. Results are streamed back to the client as events:
+
+    {"event": "log", "message": str}
+    {"event": "result", "folder": str, "data": dict}
+    {"event": "error", "message": str}
+    {"event": "done", "processed": int}
+
+Requests are pickled, so only the process that started the service may talk to it. The
+EFT Tracker picks a random address (a named pipe on Windows, a Unix socket in a private
+temporary folder elsewhere) and a random key for every launch and hands both to the service
+in its environment, never on the command line.
+
+Run it with "OCR.exe --service" or "python -m src.ocr_service", started by the EFT Tracker.
+"""
+import os
+import sys
+import time
+import atexit
+import shutil
+import secrets
+import tempfile
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+
+# The OCR modules are imported by the service only, so the EFT Tracker can import the client
+# without loading OpenCV and NumPy
+
+# Environment variables the service reads its address and hex encoded key from
+ADDRESS_VARIABLE = "EFT_OCR_SERVICE_ADDRESS"
+AUTHKEY_VARIABLE = "EFT_OCR_SERVICE_AUTHKEY"
+
+AUTHKEY_BYTES = 32
+
+
+def new_service_address():
+    """Random address for one launch of the service, the socket folder is removed by OCRServiceClient.close"""
+    name = f"eft-tracker-ocr-{secrets.token_hex(8)}"
+    if sys.platform == "win32":
+        return rf"\\.\pipe\{name}"
+    # mkdtemp creates the folder readable by the current user only
+    return os.path.join(tempfile.mkdtemp(prefix="eft-tracker-"), f"{name}.sock")
+
+
+class OCRService:
+    """Serves OCR jobs with one warm reader until a shutdown command is received"""
+
+    def __init__(self, address, authkey, gpu=True, backend="auto"):
+        self.address = address
+        self.authkey = authkey
+        self.gpu = gpu
+        self.backend = backend
+        from src.ocr_engine import RaidOCREngine
+        self.engine = RaidOCREngine()
+        self.running = False
+
+    def load(self):
+        """Loads the model and runs a warm-up inference"""
+        start = time.perf_counter()
+        from src.ocr_engine import create_reader
+        self.engine.reader = create_reader(self.gpu, self.backend)
+        self.engine.warm_up()
+        print(f"OCR service ready after {time.perf_counter() - start:.1f}s", flush=True)
+
+    def serve_forever(self):
+        """Accepts one client at a time, further clients wait in the listen backlog"""
+        self.load()
+        self.running = True
+        with Listener(self.address, authkey=self.authkey) as listener:
+            while self.running:
+                try:
+                    with listener.accept() as connection:
+                        self.handle_connection(connection)
+                except (EOFError, ConnectionError, OSError) as e:
+                    print(f"OCR service connection error: {e}", flush=True)
+                except AuthenticationError:
+                    print("OCR service refused a client with a wrong key", flush=True)
+
+    def handle_connection(self, connection):
+        """Handles all requests of one client connection"""
+        while self.running:
+            try:
+                request = connection.recv()
+            except EOFError:
+                return
+
+            command = request.get("command")
+            send = connection.send
+            self.engine.log = lambda message: send({"event": "log", "message": message})
+
+            try:
+                if command == "ping":
+                    send({"event": "pong"})
+                elif command == "process_folders":
+                    self.process_folders(send, request["root_folder"], request["data_dir"],
+                                         request["archive_folder"])
+                elif command == "process_images":
+                    data = self.engine.process_images(request["images"])
+                    send({"event": "result", "folder": request.get("name", ""), "data": data})
+                    send({"event": "done", "processed": 1})
+                elif command == "shutdown":
+                    self.running = False
+                    send({"event": "done", "processed": 0})
+                else:
+                    send({"event": "error", "message": f"Unknown command: {command}"})
+            except Exception as e:
+                send({"event": "error", "message": str(e)})
+            finally:
+                self.engine.log = print
+
+    def process_folders(self, send, root_folder, data_dir, archive_folder):
+        """OCRs every complete raid folder in root_folder and streams each result as soon as it is done"""
+        from src.ocr_engine import save_and_archive, list_raid_folders
+        from src.ocr_cache import OCRResultCache
+        from src.ocr_journal import RaidJournal
+
+        for directory in [data_dir, root_folder, archive_folder]:
+            os.makedirs(directory, exist_ok=True)
+
+        cache_path = os.path.join(data_dir, "ocr_cache.sqlite")
+        if self.engine.cache is None or self.engine.cache.path != cache_path:
+            if self.engine.cache is not None:
+                self.engine.cache.close()
+            self.engine.cache = OCRResultCache(cache_path)
+
+        processed = 0
+        for subfolder in list_raid_folders(root_folder):
+            png_files = [f for f in os.listdir(subfolder) if f.endswith('.png')]
+            if len(png_files) != 4:
+                self.engine.log(f"Skipping folder {subfolder}: Expected 4 PNG files, found {len(png_files)}")
+                continue
+
+            self.engine.log(f"Processing folder: {subfolder}")
+            try:
+                data = self.engine.process_folder(subfolder, RaidJournal(data_dir, subfolder))
+            except Exception as e:
+                self.engine.log(f"Error processing folder {subfolder}: {e}")
+                continue
+
+            save_and_archive(subfolder, data, data_dir, archive_folder, self.engine.log)
+            send({"event": "result", "folder": os.path.basename(subfolder), "data": data})
+            processed += 1
+
+        send({"event": "done", "processed": processed})
+
+
+class OCRServiceClient:
+    """Client side of the OCR service, with a new random address and key unless given"""
+
+    def __init__(self, address=None, authkey=None):
+        self.address = address or new_service_address()
+        self.authkey = authkey or secrets.token_bytes(AUTHKEY_BYTES)
+        # Private folder of a generated Unix socket, removed by close() at the latest on exit
+        self.socket_folder = None
+        if address is None and sys.platform != "win32":
+            self.socket_folder = os.path.dirname(self.address)
+            atexit.register(self.close)
+
+    def environment(self):
+        """Environment to start the service process with, so it listens for this client"""
+        environment = dict(os.environ)
+        environment[ADDRESS_VARIABLE] = self.address
+        environment[AUTHKEY_VARIABLE] = self.authkey.hex()
+        return environment
+
+    def connect(self):
+        """Opens a connection, raises ConnectionError if the service is not running"""
+        return Client(self.address, authkey=self.authkey)
+
+    def is_running(self):
+        """Checks whether the service accepts connections"""
+        try:
+            with self.connect() as connection:
+                connection.send({"command": "ping"})
+                return connection.recv().get("event") == "pong"
+        except (OSError, EOFError, AuthenticationError):
+            return False
+
+    def wait_until_ready(self, timeout):
+        """Waits up to timeout seconds for a starting service to accept connections"""
+        deadline = time.monotonic() + timeout
+        while not self.is_running():
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.2)
+        return True
+
+    def request(self, request):
+        """Sends one request and yields the streamed events up to and including the final one"""
+        with self.connect() as connection:
+            connection.send(request)
+            while True:
+                event = connection.recv()
+                yield event
+                if event["event"] in ("done", "error", "pong"):
+                    return
+
+    def process_folders(self, root_folder, data_dir, archive_folder):
+        """Processes all raid folders in root_folder, yields the streamed events"""
+        return self.request({"command": "process_folders", "root_folder": root_folder,
+                             "data_dir": data_dir, "archive_folder": archive_folder})
+
+    def process_images(self, images, name=""):
+        """Processes the four in-memory screenshots of one raid, yields the streamed events"""
+        return self.request({"command": "process_images", "images": images, "name": name})
+
+    def shutdown(self):
+        """Asks the service to exit after the current job"""
+        try:
+            for _ in self.request({"command": "shutdown"}):
+                pass
+        except (OSError, EOFError):
+            pass
+
+    def close(self):
+        """Removes the folder of a generated socket, call it once the service has exited"""
+        if self.socket_folder is not None:
+            shutil.rmtree(self.socket_folder, ignore_errors=True)
+            self.socket_folder = None
+
+
+def main():
+    gpu = "--cpu" not in sys.argv
+    # --backend <name> selects the recognizer backend, see ocr_backends.BACKENDS
+    backend = sys.argv[sys.argv.index("--backend") + 1] if "--backend" in sys.argv[:-1] else "auto"
+
+    address = os.environ.get(ADDRESS_VARIABLE)
+    # Removed from the environment, so the OCR worker processes don't inherit the key
+    authkey = os.environ.pop(AUTHKEY_VARIABLE, None)
+    if not address or not authkey:
+        sys.exit(f"The OCR service is started by the EFT Tracker, {ADDRESS_VARIABLE} and {AUTHKEY_VARIABLE} "
+                 f"are not set")
+    OCRService(address, bytes.fromhex(authkey), gpu=gpu, backend=backend).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
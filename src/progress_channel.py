@@ -0,0 +1,65 @@
+"""
+Batched progress reporting from a worker thread to the UI.
+
+The worker only appends its log messages and progress values to a buffer, which never
+blocks on the UI. A background thread flushes the buffer at a fixed frame rate as a single
+emit(messages, progress) call, so the GUI thread handles one update per frame instead of one
+per ROI, no matter how fast the worker logs.
+"""
+import threading
+
+# Batches per second sent to the UI
+FRAME_RATE = 20
+
+
+class ProgressChannel:
+    """Buffers log messages and the latest progress value, emit is called with each batch"""
+
+    def __init__(self, emit, frame_rate=FRAME_RATE):
+        # emit(list of messages, progress value or -1 if unchanged)
+        self.emit = emit
+        self.interval = 1.0 / frame_rate
+        self.lock = threading.Lock()
+        # Held by flush while emitting, so batches from the flusher and other threads stay in
+        # order without blocking log() and set_progress(). Reentrant for slots that flush
+        self.emit_lock = threading.RLock()
+        self.messages = []
+        self.progress = -1
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def log(self, message):
+        with self.lock:
+            self.messages.append(message)
+
+    def set_progress(self, value):
+        with self.lock:
+            self.progress = value
+
+    def flush(self):
+        """Sends everything buffered so far as one batch, nothing if the buffer is empty"""
+        with self.emit_lock:
+            with self.lock:
+                messages, progress = self.messages, self.progress
+                self.messages, self.progress = [], -1
+            # Emitted after releasing the buffer, a slot may log back into the channel
+            if messages or progress >= 0:
+                self.emit(messages, progress)
+
+    def start(self):
+        """Starts flushing in the background"""
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name="Progress channel", daemon=True)
+        self.thread.start()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+    def stop(self):
+        """Stops the background flushing and sends the last batch"""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.flush()
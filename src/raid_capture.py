@@ -0,0 +1,210 @@
+"""
+In-memory capture of the end-of-raid screens.
+
+The game monitor is grabbed into a raw BGRA buffer and only the ROI stripes of each page are
+kept, as the same grayscale StripeImage the PNG ROI decoder produces. The OCR service reads
+the four pages straight from memory, so a raid no longer needs four full-screen PNGs written
+to 'Raids new', read back and decoded.
+
+Full screenshots, for 'Raids new' without the OCR service or for the archive, are grabbed into
+memory as well and encoded as PNG by a small pool of writer threads while the next page is
+captured. zlib releases the GIL, so the writers run in parallel with the capture.
+
+PageChangeDetector replaces the fixed sleeps after clicking "Next": it polls a downsampled
+signature of the screen centre until the page has changed and stopped changing.
+"""
+import os
+import time
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2 as cv
+import numpy as np
+
+from src.roi_image_loader import stripe_image_from_frame
+
+# mss monitor index of the game, 1 is the primary monitor
+GAME_MONITOR = 1
+
+# Screen centre (y1, y2, x1, x2) in 2560x1440 coordinates that differs between all four pages
+SIGNATURE_REGION = (300, 1060, 640, 1940)
+# Every n-th pixel of the region in both directions goes into the signature
+SIGNATURE_STEP = 8
+# Mean absolute difference of the signatures (grey levels) above which the page has changed
+CHANGE_THRESHOLD = 6.0
+# A changed page is stable once this many polls in a row differ less than STABLE_THRESHOLD
+STABLE_THRESHOLD = 2.0
+STABLE_POLLS = 2
+POLL_INTERVAL = 0.015
+# Seconds to wait for the next page before capturing anyway
+PAGE_TIMEOUT = 2.0
+
+# zlib level of the written screenshots, 1 is several times faster than the default 6
+# and the files are only slightly larger
+PNG_COMPRESSION_LEVEL = 1
+WRITER_THREADS = 2
+
+
+def screenshot_name(folder_name, page):
+    """File name of screenshot 1-4 of a raid, as written by the EFT Tracker"""
+    return f"screenshot {folder_name} ({page}).png"
+
+
+def write_png(shot, path, level=PNG_COMPRESSION_LEVEL):
+    """Writes an mss screenshot as PNG, under a temporary name until it is complete"""
+    import mss.tools
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mss.tools.to_png(shot.rgb, shot.size, level=level, output=path + ".part")
+    os.replace(path + ".part", path)
+
+
+def signature_difference(a, b):
+    return float(np.abs(a - b).mean())
+
+
+class PageChangeDetector:
+    """
+    Waits for the next page after a click by polling a small downsampled part of the screen.
+    Use it from one thread only, like RaidCapture.
+    """
+
+    def __init__(self, monitor=GAME_MONITOR, timeout=PAGE_TIMEOUT, sct=None):
+        import mss
+
+        self.sct = sct or mss.mss()
+        self.timeout = timeout
+        # Signature region in the coordinates of the game monitor
+        screen = self.sct.monitors[monitor]
+        y1, y2, x1, x2 = SIGNATURE_REGION
+        scale_x, scale_y = screen["width"] / 2560, screen["height"] / 1440
+        self.region = {"left": screen["left"] + int(x1 * scale_x), "top": screen["top"] + int(y1 * scale_y),
+                       "width": int((x2 - x1) * scale_x), "height": int((y2 - y1) * scale_y)}
+        # Wait time and whether the page changed in time, per waited page
+        self.waits = []
+
+    def signature(self):
+        """Green channel of every SIGNATURE_STEP-th pixel of the region, close enough to the brightness"""
+        shot = self.sct.grab(self.region)
+        frame = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return frame[::SIGNATURE_STEP, ::SIGNATURE_STEP, 1].astype(np.int16)
+
+    def wait_for_change(self, before):
+        """
+        Waits until the screen differs from the signature before and then stays the same
+        Returns (seconds waited, True if the page changed and settled before the timeout)
+        """
+        start = time.perf_counter()
+        deadline = start + self.timeout
+        changed = False
+        previous = before
+        stable = 0
+        while time.perf_counter() < deadline:
+            current = self.signature()
+            if not changed:
+                changed = signature_difference(current, before) > CHANGE_THRESHOLD
+            elif signature_difference(current, previous) < STABLE_THRESHOLD:
+                stable += 1
+                if stable >= STABLE_POLLS:
+                    break
+            else:
+                stable = 0
+            previous = current
+            time.sleep(POLL_INTERVAL)
+
+        seconds = time.perf_counter() - start
+        ready = changed and stable >= STABLE_POLLS
+        self.waits.append((seconds, ready))
+        return seconds, ready
+
+    def stats(self):
+        waits = ", ".join(f"{seconds * 1000:.0f} ms" + ("" if ready else " (timeout)") for seconds, ready in self.waits)
+        return f"Page waits: {waits}"
+
+    def close(self):
+        self.sct.close()
+
+
+class RaidCapture:
+    """
+    Captures the pages of one raid into memory.
+    Use it from one thread only, the mss handles belong to the thread that created them.
+    """
+
+    def __init__(self, folder_name, monitor=GAME_MONITOR, png_folder=None, keep_rois=True,
+                 compression_level=PNG_COMPRESSION_LEVEL, writer_threads=WRITER_THREADS):
+        import mss
+
+        self.folder_name = folder_name
+        self.sct = mss.mss()
+        self.monitor = self.sct.monitors[monitor]
+        # Full screenshots are written to png_folder/folder_name in the background if set
+        self.png_folder = png_folder
+        self.compression_level = compression_level
+        self.writer = ThreadPoolExecutor(writer_threads, thread_name_prefix="Screenshot writer") if png_folder else None
+        self.writes = []
+        # Without keep_rois only the screenshots are written, for the OCR to read them later
+        self.keep_rois = keep_rois
+        # ROI stripes of the captured pages, in page order
+        self.pages = []
+        self.grab_seconds = []
+        self.first_capture = None
+
+    def capture_page(self):
+        """Grabs the next page and returns its ROI stripes, None without keep_rois"""
+        start = time.perf_counter()
+        if self.first_capture is None:
+            self.first_capture = start
+
+        shot = self.sct.grab(self.monitor)
+        page = len(self.grab_seconds)
+        if self.keep_rois:
+            frame = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+            self.pages.append(stripe_image_from_frame(frame, page))
+
+        if self.writer is not None:
+            path = os.path.join(self.png_folder, self.folder_name, screenshot_name(self.folder_name, page + 1))
+            self.writes.append(self.writer.submit(write_png, shot, path, self.compression_level))
+
+        self.grab_seconds.append(time.perf_counter() - start)
+        return self.pages[-1] if self.keep_rois else None
+
+    def wait_for_writes(self):
+        """Waits until all screenshots are written, returns the errors of the failed writes"""
+        return [str(write.exception()) for write in self.writes if write.exception() is not None]
+
+    def requeue(self, folder):
+        """
+        Puts the raid into folder ('Raids new') for the normal OCR after its in-memory OCR failed
+        The written screenshots are moved there, without them the ROI stripes are written on
+        black pages, which is all the OCR reads. Returns the raid folder.
+        """
+        target = os.path.join(folder, self.folder_name)
+        if self.png_folder is not None and len(self.writes) == len(self.grab_seconds) and not self.wait_for_writes():
+            shutil.move(os.path.join(self.png_folder, self.folder_name), target)
+            return target
+
+        os.makedirs(target, exist_ok=True)
+        for page, image in enumerate(self.pages):
+            full = np.zeros(image.shape, dtype=np.uint8)
+            for y1, y2, array in image.stripes:
+                full[y1:y2] = array
+            ok, data = cv.imencode(".png", full)
+            path = os.path.join(target, screenshot_name(self.folder_name, page + 1))
+            with open(path + ".part", 'wb') as f:
+                f.write(data.tobytes())
+            os.replace(path + ".part", path)
+        return target
+
+    def stats(self):
+        grab_ms = sum(self.grab_seconds) * 1000
+        if not self.keep_rois:
+            return f"Captured {len(self.grab_seconds)} pages ({grab_ms:.0f} ms grab)"
+        size = sum(page.nbytes for page in self.pages) / 1e6
+        return f"Captured {len(self.pages)} pages in memory ({grab_ms:.0f} ms grab and crop, {size:.1f} MB of ROIs)"
+
+    def close(self):
+        """Releases the screen grabber, screenshots still being written are finished in the background"""
+        self.sct.close()
+        if self.writer is not None:
+            self.writer.shutdown(wait=False)
@@ -0,0 +1,134 @@
+"""
+Watches "Raids new" for raid folders whose four screenshots have been completely written.
+
+On Linux the watcher sleeps on inotify events of the root folder and its raid folders, so a
+new raid is noticed as soon as its last screenshot is closed. Everywhere else, or if inotify
+is not available, it falls back to polling the folder. Either way a folder only counts as
+ready once it has its 4 PNGs and every one of them ends with the IEND chunk, so screenshots
+that are still being written are never picked up.
+"""
+import os
+import sys
+import time
+import select
+import ctypes
+import ctypes.util
+
+from src.ocr_engine import list_raid_folders
+
+# The last 12 bytes of every complete PNG: empty IEND chunk with its CRC
+PNG_END = b"\x00\x00\x00\x00IEND\xaeB`\x82"
+
+# inotify event masks, see inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+
+
+def png_complete(path):
+    """Checks that a PNG file has been written up to its IEND chunk"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(-len(PNG_END), os.SEEK_END)
+            return f.read() == PNG_END
+    except OSError:
+        return False
+
+
+def folder_ready(subfolder, expected_files=4):
+    """Checks that a raid folder contains its screenshots and that all of them are complete"""
+    try:
+        png_files = [f for f in os.listdir(subfolder) if f.endswith('.png')]
+    except OSError:
+        return False
+    return len(png_files) == expected_files and all(png_complete(os.path.join(subfolder, f)) for f in png_files)
+
+
+class Inotify:
+    """Minimal inotify binding through ctypes, only used to wake up on changes"""
+
+    def __init__(self):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # path -> watch descriptor
+        self.watches = {}
+
+    def watch(self, path, mask):
+        if path in self.watches:
+            return
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd >= 0:
+            self.watches[path] = wd
+
+    def unwatch_missing(self):
+        """Drops the watches of folders that were moved away or deleted"""
+        for path in [path for path in self.watches if not os.path.isdir(path)]:
+            self.libc.inotify_rm_watch(self.fd, self.watches.pop(path))
+
+    def wait(self, timeout):
+        """Blocks until events arrive or timeout seconds passed, the events themselves are discarded"""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if readable:
+            try:
+                while os.read(self.fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        os.close(self.fd)
+
+
+class RaidFolderWatcher:
+    """Reports each raid folder in root_folder once, as soon as its screenshots are complete"""
+
+    def __init__(self, root_folder, poll_interval=1.0, log=print):
+        self.root_folder = root_folder
+        self.poll_interval = poll_interval
+        self.log = log
+        self.reported = set()
+
+        self.inotify = None
+        if sys.platform.startswith("linux"):
+            try:
+                self.inotify = Inotify()
+                self.inotify.watch(root_folder, IN_CREATE | IN_MOVED_TO)
+            except (OSError, AttributeError) as e:
+                self.log(f"inotify not available ({e}), polling '{root_folder}' instead")
+                self.inotify = None
+
+        mode = "inotify" if self.inotify is not None else f"polling every {poll_interval}s"
+        self.log(f"Watching '{root_folder}' for new raids ({mode})")
+
+    def ready_folders(self):
+        """Returns the raid folders that became ready since the last call, oldest first"""
+        subfolders = list_raid_folders(self.root_folder)
+
+        # Folders that were archived may show up again under the same name
+        self.reported &= set(subfolders)
+
+        if self.inotify is not None:
+            self.inotify.unwatch_missing()
+            for subfolder in subfolders:
+                self.inotify.watch(subfolder, IN_CLOSE_WRITE | IN_MOVED_TO)
+
+        ready = [subfolder for subfolder in subfolders
+                 if subfolder not in self.reported and folder_ready(subfolder)]
+        self.reported.update(ready)
+        return ready
+
+    def wait(self, timeout=None):
+        """Blocks until something changed in the watched folders, at most timeout seconds"""
+        if timeout is None:
+            timeout = self.poll_interval
+        if self.inotify is not None:
+            self.inotify.wait(timeout)
+        else:
+            time.sleep(min(timeout, self.poll_interval))
+
+    def close(self):
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
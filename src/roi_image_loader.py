@@ -0,0 +1,187 @@
+"""
+Decoding of only the screenshot rows that the ROI tables need.
+
+The screenshots written by mss are non-interlaced 8-bit RGB PNGs whose scanlines use
+no filter, so their pixel rows can be reconstructed one after another while the zlib
+stream is inflated. Decoding stops after the last needed row and only the horizontal
+stripes around the ROIs are kept, converted to grayscale. PNGs this decoder can't handle
+(other encoders, Average/Paeth filters) fall back to a grayscale cv.imread.
+"""
+import os
+import zlib
+import struct
+import cv2 as cv
+import numpy as np
+
+from src.ocr_regions import page_row_ranges
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Extra rows kept above and below every ROI stripe
+STRIPE_MARGIN = 2
+
+# Bytes inflated per step while streaming the image data
+INFLATE_STEP = 1 << 16
+
+
+class UnsupportedPNG(Exception):
+    """Raised when the streaming decoder can't handle a PNG"""
+
+
+class StripeImage:
+    """
+    Sparse grayscale screenshot made of horizontal stripes.
+    Supports the img[y1:y2, x1:x2] slicing used for the ROIs, in full resolution coordinates.
+    """
+
+    def __init__(self, height, width, stripes, scale=1):
+        self.shape = (height, width)
+        self.ndim = 2
+        # List of (y1, y2, array) in full resolution rows
+        self.stripes = stripes
+        self.scale = scale
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for y1, y2, array in self.stripes)
+
+    def __getitem__(self, key):
+        rows, columns = key
+        for y1, y2, array in self.stripes:
+            if y1 <= rows.start and rows.stop <= y2:
+                s = self.scale
+                return array[(rows.start - y1) // s:(rows.stop - y1) // s, columns.start // s:columns.stop // s]
+        raise IndexError(f"Rows {rows.start}-{rows.stop} were not decoded")
+
+
+def read_header(f):
+    """Reads the signature and IHDR chunk, returns (width, height, channels)"""
+    if f.read(8) != PNG_SIGNATURE:
+        raise UnsupportedPNG("Not a PNG file")
+
+    length, chunk_type = struct.unpack(">I4s", f.read(8))
+    if chunk_type != b"IHDR":
+        raise UnsupportedPNG("Missing IHDR chunk")
+    width, height, bit_depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", f.read(length))
+    f.read(4)
+
+    if bit_depth != 8 or color_type not in (2, 6) or interlace != 0:
+        raise UnsupportedPNG("Only non-interlaced 8-bit RGB/RGBA is supported")
+    return width, height, 3 if color_type == 2 else 4
+
+
+def read_image_data(f):
+    """Yields the compressed image data in pieces of at most INFLATE_STEP bytes"""
+    while True:
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        length, chunk_type = struct.unpack(">I4s", header)
+        if chunk_type == b"IEND":
+            return
+        if chunk_type != b"IDAT":
+            f.seek(length + 4, os.SEEK_CUR)
+            continue
+
+        while length > 0:
+            piece = f.read(min(length, INFLATE_STEP))
+            length -= len(piece)
+            yield piece
+        f.read(4)
+
+
+def decode_png_rows(path, row_ranges):
+    """
+    Decodes only the given (y1, y2) row ranges of an unfiltered RGB/RGBA PNG
+    The file is read and inflated only up to the last needed row
+    Returns (height, width, [(y1, y2, rgb_array), ...])
+    """
+    with open(path, 'rb') as f:
+        width, height, channels = read_header(f)
+        stride = 1 + width * channels
+        last_row = min(height, max(y2 for y1, y2 in row_ranges))
+        stripes = [(y1, y2, np.empty((y2 - y1, width, 3), dtype=np.uint8)) for y1, y2 in row_ranges]
+
+        inflater = zlib.decompressobj()
+        pieces = read_image_data(f)
+        buffer = b""
+        offset = 0
+        previous = np.zeros(width * channels, dtype=np.uint8)
+        row = 0
+
+        while row < last_row:
+            # Inflate just enough to reconstruct the next rows
+            while len(buffer) - offset < stride:
+                piece = next(pieces, None)
+                if piece is None:
+                    raise UnsupportedPNG("Image data ended early")
+                buffer = buffer[offset:] + inflater.decompress(piece)
+                offset = 0
+
+            while len(buffer) - offset >= stride and row < last_row:
+                filter_type = buffer[offset]
+                line = np.frombuffer(buffer, dtype=np.uint8, count=stride - 1, offset=offset + 1)
+                if filter_type == 0:
+                    current = line
+                elif filter_type == 1:
+                    current = np.cumsum(line.reshape(width, channels), axis=0, dtype=np.uint8).reshape(-1)
+                elif filter_type == 2:
+                    current = line + previous
+                else:
+                    raise UnsupportedPNG(f"Filter type {filter_type} is not supported")
+                offset += stride
+
+                for y1, y2, array in stripes:
+                    if y1 <= row < y2:
+                        array[row - y1] = current.reshape(width, channels)[:, :3]
+                previous = current
+                row += 1
+
+    return height, width, stripes
+
+
+def load_roi_image(path, page, scale=1):
+    """
+    Loads the ROI stripes of screenshot page 0-3 as a grayscale StripeImage
+    scale 2 keeps every stripe in half resolution, for regions with large enough text
+    """
+    row_ranges = page_row_ranges(page, STRIPE_MARGIN)
+    try:
+        height, width, rgb_stripes = decode_png_rows(path, row_ranges)
+        stripes = [(y1, y2, cv.cvtColor(array, cv.COLOR_RGB2GRAY)) for y1, y2, array in rgb_stripes]
+    except (UnsupportedPNG, struct.error, zlib.error):
+        full = cv.imread(path, cv.IMREAD_GRAYSCALE)
+        height, width = full.shape
+        stripes = [(y1, y2, full[y1:y2].copy()) for y1, y2 in row_ranges]
+
+    return StripeImage(height, width, scale_stripes(stripes, scale), scale)
+
+
+def stripe_image_from_frame(frame, page, scale=1):
+    """
+    Keeps the ROI stripes of an in-memory BGR or BGRA screenshot of page 0-3 as a grayscale
+    StripeImage, the same as load_roi_image returns for the screenshot's PNG
+    """
+    code = cv.COLOR_BGRA2GRAY if frame.shape[2] == 4 else cv.COLOR_BGR2GRAY
+    stripes = [(y1, y2, cv.cvtColor(frame[y1:y2], code)) for y1, y2 in page_row_ranges(page, STRIPE_MARGIN)]
+    return StripeImage(frame.shape[0], frame.shape[1], scale_stripes(stripes, scale), scale)
+
+
+def scale_stripes(stripes, scale):
+    """Downscales the stripes by an integer factor, 1 keeps them as they are"""
+    if scale == 1:
+        return stripes
+    return [(y1, y2, cv.resize(array, (array.shape[1] // scale, array.shape[0] // scale),
+                               interpolation=cv.INTER_AREA))
+            for y1, y2, array in stripes]
+
+
+def load_raid_images(subfolder, scales=(1, 1, 1, 1), pages=None):
+    """
+    Loads the ROI stripes of the four screenshots of a raid folder in page order
+    Only the given pages are decoded if pages is set, the others are None
+    """
+    png_files = sorted(f for f in os.listdir(subfolder) if f.endswith('.png'))
+    return [load_roi_image(os.path.join(subfolder, png), page, scales[page])
+            if pages is None or page in pages else None
+            for page, png in enumerate(png_files)]
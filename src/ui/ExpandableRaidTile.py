@@ -524,6 +524,18 @@ class ExpandableRaidTile(QFrame):
         # Konstruiere den Pfad zum Screenshots-Ordner
         screenshot_path = os.path.join("Raids old", folder_name)
 
+        # Compacted raids are unpacked into a temporary folder: preview with the original text regions
+        if not os.path.exists(screenshot_path):
+            from src.archive_compactor import pack_path, extract_pages
+            if os.path.isfile(pack_path(screenshot_path)):
+                import tempfile
+                try:
+                    screenshot_path = extract_pages(pack_path(screenshot_path),
+                                                    os.path.join(tempfile.gettempdir(), "EFT Tracker", folder_name))
+                except Exception as e:
+                    QMessageBox.critical(self, "Fehler", f"Fehler beim Entpacken der Screenshots:\n{str(e)}")
+                    return
+
         # Überprüfe, ob der Ordner existiert
         if not os.path.exists(screenshot_path):
             QMessageBox.warning(
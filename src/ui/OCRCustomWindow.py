@@ -1,4 +1,7 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QFrame, QHBoxLayout, QPushButton, QLabel, QProgressBar, QTextEdit
+import os
+
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QFrame, QHBoxLayout, QPushButton, QLabel, QProgressBar, QTextEdit,
+                             QSpinBox)
 
 from src.OCR import OCRWorker
 from src.ui.BorderlessMainWindow import BorderlessMainWindow
@@ -14,8 +17,7 @@ class OCRCustomWindow(BorderlessMainWindow):
 
         # OCR Worker-Thread erstellen
         self.ocr_worker = OCRWorker()
-        self.ocr_worker.progress_update.connect(self.update_log)
-        self.ocr_worker.progress_value.connect(self.update_progress)
+        self.ocr_worker.progress_batch.connect(self.update_batch)
         self.ocr_worker.processing_finished.connect(self.processing_finished)
         self.ocr_worker.processing_error.connect(self.processing_error)
 
@@ -61,6 +63,37 @@ class OCRCustomWindow(BorderlessMainWindow):
         """)
         self.start_button.clicked.connect(self.start_processing)
 
+        # Watch button: keeps the worker running and OCRs new raids as soon as they are saved
+        self.watch_button = QPushButton("Watch 'Raids new'")
+        self.watch_button.setCheckable(True)
+        self.watch_button.setMinimumHeight(40)
+        self.watch_button.setStyleSheet(self.start_button.styleSheet() + """
+            QPushButton:checked {
+                background-color: #6b4c2a;
+                border: 1px solid #f6e7c5;
+            }
+        """)
+        self.watch_button.toggled.connect(self.toggle_watch)
+
+        # Number of OCR worker processes, more process several raids at once
+        self.processes_label = QLabel("Processes:")
+        self.processes_label.setStyleSheet("color: #f6e7c5;")
+        self.processes_spin = QSpinBox()
+        self.processes_spin.setRange(1, os.cpu_count() or 1)
+        self.processes_spin.setValue(self.ocr_worker.worker_processes)
+        self.processes_spin.setToolTip("OCR worker processes, each loads its own OCR model.\n"
+                                       "1 uses the preloaded model, more only pay off for large backlogs on the CPU")
+        self.processes_spin.setStyleSheet("""
+            QSpinBox {
+                background-color: #1A1A1A;
+                color: #f6e7c5;
+                border: 1px solid #444444;
+                border-radius: 4px;
+                padding: 4px;
+            }
+        """)
+        self.processes_spin.valueChanged.connect(self.set_worker_processes)
+
         # Status label
         self.status_label = QLabel("Ready")
         self.status_label.setStyleSheet("color: #f6e7c5; font-weight: bold;")
@@ -89,6 +122,9 @@ class OCRCustomWindow(BorderlessMainWindow):
 
         # Add controls to layout
         control_layout.addWidget(self.start_button)
+        control_layout.addWidget(self.watch_button)
+        control_layout.addWidget(self.processes_label)
+        control_layout.addWidget(self.processes_spin)
         control_layout.addWidget(self.status_label)
         control_layout.addWidget(self.progress_bar, 1)
 
@@ -226,8 +262,37 @@ class OCRCustomWindow(BorderlessMainWindow):
         self.progress_bar.setValue(0)
 
         # Start worker thread
+        self.ocr_worker.watch = False
+        self.watch_button.setEnabled(False)
+        self.processes_spin.setEnabled(False)
         self.ocr_worker.start()
 
+    def set_worker_processes(self, value):
+        """Sets the number of OCR worker processes of the next run"""
+        self.ocr_worker.worker_processes = value
+
+    def toggle_watch(self, checked):
+        """Starts or stops watching 'Raids new' for new raids"""
+        if checked:
+            self.log_text.clear()
+            self.start_button.setEnabled(False)
+            self.status_label.setText("Watching...")
+            self.progress_bar.setValue(0)
+
+            self.ocr_worker.watch = True
+            self.ocr_worker.start()
+        else:
+            # The worker finishes the raid it is working on and then stops
+            self.status_label.setText("Stopping...")
+            self.ocr_worker.requestInterruption()
+
+    def update_batch(self, messages, progress):
+        """Shows a batch of worker messages with a single append, and the latest progress value"""
+        if messages:
+            self.update_log("\n".join(messages))
+        if progress >= 0:
+            self.update_progress(progress)
+
     def update_log(self, message):
         """Update log with new message"""
         self.log_text.append(message)
@@ -236,22 +301,33 @@ class OCRCustomWindow(BorderlessMainWindow):
         """Update progress bar"""
         self.progress_bar.setValue(value)
 
+    def reset_buttons(self):
+        """Re-enables the buttons once the worker has stopped"""
+        self.start_button.setEnabled(True)
+        self.watch_button.setEnabled(True)
+        self.processes_spin.setEnabled(True)
+        self.watch_button.blockSignals(True)
+        self.watch_button.setChecked(False)
+        self.watch_button.blockSignals(False)
+
     def processing_finished(self):
         """Called when processing is complete"""
-        self.start_button.setEnabled(True)
+        self.reset_buttons()
         self.status_label.setText("Processing complete")
         self.update_log("=== OCR Processing Complete ===")
 
     def processing_error(self, error_msg):
         """Called when processing encounters an error"""
-        self.start_button.setEnabled(True)
+        self.reset_buttons()
         self.status_label.setText("Error")
         self.update_log(f"ERROR: {error_msg}")
 
     def closeEvent(self, event):
         """Handle window close event"""
-        # Stop worker thread if running
+        # Stop worker thread if running, give it a moment to finish the current raid first
         if self.ocr_worker.isRunning():
-            self.ocr_worker.terminate()
-            self.ocr_worker.wait()
+            self.ocr_worker.requestInterruption()
+            if not self.ocr_worker.wait(3000):
+                self.ocr_worker.terminate()
+                self.ocr_worker.wait()
         event.accept()